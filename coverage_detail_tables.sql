@@ -0,0 +1,25 @@
+-- Tables used by per-line and per-function coverage uploads (--coverage-detail).
+-- coverage_lines holds one row per tracefile record: line_states run-length encodes every line from
+-- first_line on as h (hit), m (missed) or n (not instrumented), e.g. '3h1m12n2h'; branch_states lists
+-- BRDA results per line as 'line:states' groups separated by ';', e.g. '12:hm;30:hhmn'. Either is NULL when the
+-- record has no DA or BRDA lines, and directory is NULL for files at the source root.
+-- coverage_functions holds one row per function with its FN line and summed FNDA hits.
+CREATE TABLE IF NOT EXISTS daily_build.coverage_lines (
+    exec_id BIGINT UNSIGNED NOT NULL,
+    directory VARCHAR(512) NULL,
+    file_name VARCHAR(255) NOT NULL,
+    first_line INT NULL,
+    line_states MEDIUMTEXT NULL,
+    branch_states MEDIUMTEXT NULL,
+    KEY idx_coverage_lines_exec (exec_id, directory, file_name)
+);
+
+CREATE TABLE IF NOT EXISTS daily_build.coverage_functions (
+    exec_id BIGINT UNSIGNED NOT NULL,
+    directory VARCHAR(512) NULL,
+    file_name VARCHAR(255) NOT NULL,
+    function TEXT NOT NULL,
+    line INT NULL,
+    hits BIGINT NOT NULL,
+    KEY idx_coverage_functions_exec (exec_id, directory, file_name)
+);
@@ -0,0 +1,17 @@
+-- Tables used by incremental coverage uploads (--coverage-snapshot).
+-- coverage_increments links an incremental execution to the full execution it was diffed against;
+-- coverage_removed_files lists files present in that base execution but missing from the new run
+-- (directory is NULL for files at the source root, as in coverage_results).
+CREATE TABLE IF NOT EXISTS daily_build.coverage_increments (
+    exec_id BIGINT UNSIGNED NOT NULL,
+    base_exec_id BIGINT UNSIGNED NOT NULL,
+    PRIMARY KEY (exec_id),
+    KEY idx_coverage_increments_base (base_exec_id)
+);
+
+CREATE TABLE IF NOT EXISTS daily_build.coverage_removed_files (
+    exec_id BIGINT UNSIGNED NOT NULL,
+    directory VARCHAR(512) NULL,
+    file_name VARCHAR(255) NOT NULL,
+    KEY idx_coverage_removed_files_exec (exec_id, directory, file_name)
+);
@@ -2,25 +2,75 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Sequence
 
-from ..artifacts import CsvArtifact
+from ..artifacts import CsvArtifact, build_artifact_name
 from ..config import RunContext
-from .coverage import build_coverage_artifacts
-from .dtk import build_dtk_artifacts
+from ..uploader import TableUpload
+from .coverage import (
+    build_coverage_artifacts,
+    preload_coverage_mappings,
+    update_coverage_snapshot,
+)
+from .dtk import build_dtk_artifacts, preload_dtk_mappings
 
 
 Analyzer = Callable[[RunContext], Iterable[CsvArtifact]]
+# Called with the run context and the uploader's per-table results once an
+# upload has committed successfully.
+AfterUpload = Callable[[RunContext, Sequence[TableUpload]], None]
 
 
 @dataclass
 class AnalyzerSpec:
     name: str
     build: Analyzer
+    after_upload: AfterUpload | None = None
+    # Loads shared inputs such as mapping tables into the current process so
+    # repeated builds (e.g. batch runs) do not reload them.
+    preload: Callable[[], None] | None = None
 
 
 def available_analyzers() -> dict[str, AnalyzerSpec]:
     return {
-        "dtk": AnalyzerSpec(name="dtk", build=build_dtk_artifacts),
-        "coverage": AnalyzerSpec(name="coverage", build=build_coverage_artifacts),
+        "dtk": AnalyzerSpec(
+            name="dtk", build=build_dtk_artifacts, preload=preload_dtk_mappings
+        ),
+        "coverage": AnalyzerSpec(
+            name="coverage",
+            build=build_coverage_artifacts,
+            after_upload=update_coverage_snapshot,
+            preload=preload_coverage_mappings,
+        ),
     }
+
+
+def build_execution_artifact(context: RunContext) -> CsvArtifact:
+    """Return the shared ``executions`` artifact describing one run."""
+
+    return CsvArtifact(
+        name=build_artifact_name(context.db_config.database, "executions"),
+        headers=[
+            "exec_id",
+            "build_type",
+            "archive_dir",
+            "device_type",
+            "started_at",
+            "completed_at",
+        ],
+        rows=[
+            {
+                "exec_id": context.exec_id,
+                "build_type": context.build_type,
+                "archive_dir": str(context.archive_dir),
+                "device_type": context.device_type,
+                "started_at": context.started_at.isoformat()
+                if context.started_at
+                else None,
+                "completed_at": context.completed_at.isoformat()
+                if context.completed_at
+                else None,
+            }
+        ],
+        column_types={"exec_id": "int64"},
+    )
@@ -2,26 +2,113 @@
 from __future__ import annotations
 
 import csv
+import functools
+import glob
+import heapq
+import io
+import operator
+import os
 import pathlib
-from typing import Iterable, Iterator
-
-from ..artifacts import CsvArtifact, build_artifact_name
+import shutil
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, BinaryIO, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from ..artifacts import CsvArtifact, build_artifact_name, open_artifact
+from ..cache import cached_rows, context_cache, file_stamp
 from ..config import RunContext
+from ..configs import checkout_dir, configs_pending, wait_for_configs
+from ..metrics import timed
+from ..uploader import TableUpload, is_test_exec_id
+
 
+T = TypeVar("T")
 
 COVERAGE_RESULTS_TABLE = "coverage_results"
+COVERAGE_INCREMENTS_TABLE = "coverage_increments"
+COVERAGE_REMOVED_FILES_TABLE = "coverage_removed_files"
+COVERAGE_LINES_TABLE = "coverage_lines"
+COVERAGE_FUNCTIONS_TABLE = "coverage_functions"
 LCOV_PATH_PREFIX = "foundation/graphic/graphic_2d_ext/ddgr/"
 COVERAGE_MAPPING_FILE = "coverage_mapping.csv"
 COVERAGE_MAPPING_OVERRIDES_FILE = "coverage_mapping_overrides.csv"
-
-
-def _resolve_info_path(context: RunContext) -> pathlib.Path:
-    """Return the lcov .info file to process based on CLI inputs."""
-
-    if context.info_path:
-        if not context.info_path.exists():
-            raise FileNotFoundError(f"Coverage info not found at {context.info_path}")
-        return context.info_path
+LCOV_SHARDS_PER_JOB = 4
+LCOV_CHUNK_SIZE = 1 << 20
+# "fast" (byte-level) or "reference" (the original line-by-line text parser).
+LCOV_PARSER_ENV_VAR = "FITS_LCOV_PARSER"
+LCOV_PARSERS = ("fast", "reference")
+COVERAGE_RESULTS_HEADERS = [
+    "exec_id",
+    "directory",
+    "file_name",
+    "lines_hit",
+    "lines_total",
+    "functions_hit",
+    "functions_total",
+    "branches_hit",
+    "branches_total",
+    "module",
+    "owner",
+]
+COVERAGE_LINES_HEADERS = [
+    "exec_id",
+    "directory",
+    "file_name",
+    "first_line",
+    "line_states",
+    "branch_states",
+]
+COVERAGE_FUNCTIONS_HEADERS = [
+    "exec_id",
+    "directory",
+    "file_name",
+    "function",
+    "line",
+    "hits",
+]
+# Run-length states in coverage_lines: hit, missed, and not instrumented.
+LINE_HIT = "h"
+LINE_MISSED = "m"
+LINE_NOT_INSTRUMENTED = "n"
+# Columns compared against the snapshot to decide whether a file changed.
+SNAPSHOT_VALUE_COLUMNS = COVERAGE_RESULTS_HEADERS[3:]
+
+
+def expand_info_paths(
+    patterns: Iterable[str], base_dir: pathlib.Path | None = None
+) -> tuple[pathlib.Path, ...]:
+    """Expand ``--info-path`` values into absolute tracefile paths.
+
+    Values with glob characters (including ``**``) are expanded in sorted
+    order and must match at least one file; plain paths are kept as given so
+    a missing file is reported by the analyzer. A file named more than once
+    is only read once.
+    """
+
+    base = base_dir or pathlib.Path.cwd()
+    paths: dict[pathlib.Path, None] = {}
+    for pattern in patterns:
+        candidate = base / pattern
+        if not any(char in pattern for char in "*?["):
+            paths[candidate.resolve()] = None
+            continue
+        matches = sorted(glob.glob(str(candidate), recursive=True))
+        if not matches:
+            raise FileNotFoundError(f"No coverage info files match {pattern}")
+        for match in matches:
+            paths[pathlib.Path(match).resolve()] = None
+    return tuple(paths)
+
+
+def _resolve_info_paths(context: RunContext) -> list[pathlib.Path]:
+    """Return the lcov .info files to process based on CLI inputs."""
+
+    if context.info_paths:
+        for info_path in context.info_paths:
+            if not info_path.exists():
+                raise FileNotFoundError(f"Coverage info not found at {info_path}")
+        return list(context.info_paths)
 
     candidates = sorted(pathlib.Path.cwd().glob("*.info"))
     if not candidates:
@@ -31,12 +118,13 @@ def _resolve_info_path(context: RunContext) -> pathlib.Path:
     if len(candidates) > 1:
         joined = ", ".join(str(path) for path in candidates)
         raise ValueError(
-            f"Multiple .info files found: {joined}. Provide --info-path to select one."
+            f"Multiple .info files found: {joined}. Provide --info-path to select one, "
+            "or repeat it (or pass a glob) to merge them."
         )
 
     chosen = candidates[0].resolve()
     print(f"Using coverage info file: {chosen}")
-    return chosen
+    return [chosen]
 
 
 def _split_directory_and_filename(sf_path: str) -> tuple[str, str]:
@@ -55,142 +143,671 @@ def _split_directory_and_filename(sf_path: str) -> tuple[str, str]:
     return "/".join(parts[:-1]), parts[-1]
 
 
-def _parse_lcov(info_path: pathlib.Path) -> list[dict[str, int | str]]:
-    """Parse an lcov .info file into per-source coverage metrics."""
-
-    files: list[dict[str, int | str]] = []
-    current: dict[str, object] | None = None
-
-    def finalize_current() -> None:
-        nonlocal current
-        if not current:
-            return
-
-        if current["lines_total"] == 0:
-            current["lines_total"] = current["lines_total_da"]
-        if current["lines_hit"] == 0:
-            current["lines_hit"] = current["lines_hit_da"]
-
-        if current["functions_total"] == 0:
-            current["functions_total"] = len(current["fn_names"])
-        if current["functions_hit"] == 0:
-            current["functions_hit"] = len(current["fn_hit"])
-
-        directory, file_name = _split_directory_and_filename(str(current["sf"]))
-        current["directory"] = directory
-        current["file_name"] = file_name
-
-        current.pop("fn_names", None)
-        current.pop("fn_hit", None)
-        current.pop("lines_total_da", None)
-        current.pop("lines_hit_da", None)
-        current.pop("sf", None)
-
-        files.append(current)  # type: ignore[arg-type]
-        current = None
+class _LcovRecord:
+    """Per-source coverage totals accumulated from a single lcov SF record."""
+
+    __slots__ = (
+        "sf",
+        "directory",
+        "file_name",
+        "lines_total",
+        "lines_hit",
+        "lines_total_da",
+        "lines_hit_da",
+        "functions_total",
+        "functions_hit",
+        "fn_names",
+        "fn_hit",
+        "branches_total",
+        "branches_hit",
+    )
 
-    with info_path.open("r", encoding="utf-8", errors="ignore") as info_file:
-        for raw in info_file:
-            line = raw.strip()
+    def __init__(self, sf: str) -> None:
+        self.sf = sf
+        self.directory = ""
+        self.file_name = ""
+        self.lines_total = 0
+        self.lines_hit = 0
+        self.lines_total_da = 0
+        self.lines_hit_da = 0
+        self.functions_total = 0
+        self.functions_hit = 0
+        self.fn_names: set[str] | None = set()
+        self.fn_hit: set[str] | None = set()
+        self.branches_total = 0
+        self.branches_hit = 0
+
+    def finalize(self) -> "_LcovRecord":
+        """Fill summary totals from detail lines and release per-file state."""
+
+        if self.lines_total == 0:
+            self.lines_total = self.lines_total_da
+        if self.lines_hit == 0:
+            self.lines_hit = self.lines_hit_da
+
+        if self.functions_total == 0:
+            self.functions_total = len(self.fn_names or ())
+        if self.functions_hit == 0:
+            self.functions_hit = len(self.fn_hit or ())
+
+        self.directory, self.file_name = _split_directory_and_filename(self.sf)
+
+        self.fn_names = None
+        self.fn_hit = None
+        return self
+
+
+def _parse_lcov_lines(lines: Iterable[str]) -> Iterator[_LcovRecord]:
+    """Yield per-source coverage metrics from lcov tracefile lines."""
+
+    current: _LcovRecord | None = None
+
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+
+        if line.startswith("SF:"):
+            if current is not None:
+                yield current.finalize()
+            current = _LcovRecord(line[3:])
+            continue
+
+        if current is None:
+            continue
+
+        if line.startswith("DA:"):
+            _, rest = line.split(":", 1)
+            parts = rest.split(",")
+            if len(parts) >= 2:
+                count = int(parts[1])
+                current.lines_total_da += 1
+                if count > 0:
+                    current.lines_hit_da += 1
+            continue
+
+        if line.startswith("LH:"):
+            _, value = line.split(":", 1)
+            current.lines_hit = int(value)
+            continue
+
+        if line.startswith("LF:"):
+            _, value = line.split(":", 1)
+            current.lines_total = int(value)
+            continue
+
+        if line.startswith("FN:"):
+            _, rest = line.split(":", 1)
+            parts = rest.split(",", 1)
+            if len(parts) == 2:
+                current.fn_names.add(parts[1])
+            continue
+
+        if line.startswith("FNDA:"):
+            _, rest = line.split(":", 1)
+            parts = rest.split(",", 1)
+            if len(parts) == 2:
+                count_str, name = parts
+                current.fn_names.add(name)
+                if int(count_str) > 0:
+                    current.fn_hit.add(name)
+            continue
+
+        if line.startswith("FNF:"):
+            _, value = line.split(":", 1)
+            if current.functions_total == 0:
+                current.functions_total = int(value)
+            continue
+
+        if line.startswith("FNH:"):
+            _, value = line.split(":", 1)
+            if current.functions_hit == 0:
+                current.functions_hit = int(value)
+            continue
+
+        if line.startswith("BRDA:"):
+            _, rest = line.split(":", 1)
+            parts = rest.split(",")
+            if len(parts) == 4:
+                taken = parts[3]
+                current.branches_total += 1
+                if taken != "-" and int(taken) > 0:
+                    current.branches_hit += 1
+            continue
+
+        if line.startswith("BRF:"):
+            _, value = line.split(":", 1)
+            if current.branches_total == 0:
+                current.branches_total = int(value)
+            continue
+
+        if line.startswith("BRH:"):
+            _, value = line.split(":", 1)
+            if current.branches_hit == 0:
+                current.branches_hit = int(value)
+            continue
+
+        if line == "end_of_record":
+            yield current.finalize()
+            current = None
+
+    if current is not None:
+        yield current.finalize()
+
+
+def _lcov_line_blocks(handle: BinaryIO) -> Iterator[list[bytes]]:
+    """Yield the lines of a binary lcov stream, one list per chunk read.
+
+    ``\r`` and ``\r\n`` end lines as in text mode; the blank lines this
+    leaves behind are skipped by the parser.
+    """
+
+    tail = b""
+    while True:
+        chunk = handle.read(LCOV_CHUNK_SIZE)
+        if not chunk:
+            break
+        if tail:
+            chunk = tail + chunk
+        if b"\r" in chunk:
+            chunk = chunk.replace(b"\r", b"\n")
+        lines = chunk.split(b"\n")
+        tail = lines.pop()
+        yield lines
+    if tail:
+        yield [tail]
+
+
+def _parse_lcov_blocks(blocks: Iterable[list[bytes]]) -> Iterator[_LcovRecord]:
+    """Byte-level equivalent of :func:`_parse_lcov_lines`.
+
+    ``DA:`` and ``BRDA:`` lines, nearly all of a tracefile, are tested first
+    and their counts are taken with ``partition`` instead of ``split``.
+    Function names are kept as bytes since they are only counted.
+    """
+
+    current: _LcovRecord | None = None
+
+    for lines in blocks:
+        for line in lines:
+            line = line.strip()
             if not line:
                 continue
 
-            if line.startswith("SF:"):
-                finalize_current()
-                current = {
-                    "sf": line[3:],
-                    "lines_total": 0,
-                    "lines_hit": 0,
-                    "lines_total_da": 0,
-                    "lines_hit_da": 0,
-                    "functions_total": 0,
-                    "functions_hit": 0,
-                    "fn_names": set(),
-                    "fn_hit": set(),
-                    "branches_total": 0,
-                    "branches_hit": 0,
-                }
+            if line[:3] == b"DA:":
+                if current is None:
+                    continue
+                _, comma, rest = line.partition(b",")
+                if comma:
+                    count = rest.partition(b",")[0]
+                    current.lines_total_da += 1
+                    # Plain digit strings are hit unless all zeros; int() handles the rest.
+                    if count == b"0":
+                        pass
+                    elif count.isdigit():
+                        if count.strip(b"0"):
+                            current.lines_hit_da += 1
+                    elif int(count) > 0:
+                        current.lines_hit_da += 1
                 continue
 
-            if current is None:
+            if line[:5] == b"BRDA:":
+                if current is None:
+                    continue
+                if line.count(b",") == 3:
+                    taken = line.rpartition(b",")[2]
+                    current.branches_total += 1
+                    if taken != b"-" and taken != b"0" and int(taken) > 0:
+                        current.branches_hit += 1
                 continue
 
-            if line.startswith("DA:"):
-                _, rest = line.split(":", 1)
-                parts = rest.split(",")
-                if len(parts) >= 2:
-                    count = int(parts[1])
-                    current["lines_total_da"] += 1
-                    if count > 0:
-                        current["lines_hit_da"] += 1
+            if line.startswith(b"SF:"):
+                if current is not None:
+                    yield current.finalize()
+                current = _LcovRecord(line.decode("utf-8", errors="ignore").strip()[3:])
                 continue
 
-            if line.startswith("LH:"):
-                _, value = line.split(":", 1)
-                current["lines_hit"] = int(value)
+            if current is None:
                 continue
 
-            if line.startswith("LF:"):
-                _, value = line.split(":", 1)
-                current["lines_total"] = int(value)
+            if line.startswith(b"FN"):
+                if line.startswith(b"FN:"):
+                    _, comma, name = line.partition(b",")
+                    if comma:
+                        current.fn_names.add(name)
+                elif line.startswith(b"FNDA:"):
+                    count, comma, name = line[5:].partition(b",")
+                    if comma:
+                        current.fn_names.add(name)
+                        if int(count) > 0:
+                            current.fn_hit.add(name)
+                elif line.startswith(b"FNF:"):
+                    if current.functions_total == 0:
+                        current.functions_total = int(line[4:])
+                elif line.startswith(b"FNH:"):
+                    if current.functions_hit == 0:
+                        current.functions_hit = int(line[4:])
                 continue
 
-            if line.startswith("FN:"):
-                _, rest = line.split(":", 1)
-                parts = rest.split(",", 1)
-                if len(parts) == 2:
-                    current["fn_names"].add(parts[1])
-                continue
+            if line.startswith(b"LH:"):
+                current.lines_hit = int(line[3:])
+            elif line.startswith(b"LF:"):
+                current.lines_total = int(line[3:])
+            elif line.startswith(b"BRF:"):
+                if current.branches_total == 0:
+                    current.branches_total = int(line[4:])
+            elif line.startswith(b"BRH:"):
+                if current.branches_hit == 0:
+                    current.branches_hit = int(line[4:])
+            elif line == b"end_of_record":
+                yield current.finalize()
+                current = None
+
+    if current is not None:
+        yield current.finalize()
+
+
+def _add_taken(total: int | None, taken: int | None) -> int | None:
+    """Sum two BRDA taken counts, where None is lcov's ``-`` (never evaluated)."""
+
+    if total is None:
+        return taken
+    if taken is None:
+        return total
+    return total + taken
+
+
+class _LcovDetail:
+    """Per-line, per-branch, and per-function data from a single lcov SF record."""
+
+    __slots__ = ("sf", "index", "lines", "branches", "functions")
+
+    def __init__(self, sf: str, index: int = 0) -> None:
+        self.sf = sf
+        # position of the record within its tracefile
+        self.index = index
+        # line number -> summed DA hits
+        self.lines: dict[int, int] = {}
+        # line number -> {(block, branch): summed taken count or None} in file order
+        self.branches: dict[int, dict[tuple[bytes, bytes], int | None]] = {}
+        # function name -> [FN line or None, summed FNDA hits]
+        self.functions: dict[bytes, list] = {}
+
+    def merge(self, other: "_LcovDetail") -> None:
+        """Add *other*'s hits to this record, keeping the union of all entries."""
+
+        lines = self.lines
+        for number, hits in other.lines.items():
+            lines[number] = lines.get(number, 0) + hits
+
+        for number, branches in other.branches.items():
+            target = self.branches.setdefault(number, {})
+            for key, taken in branches.items():
+                target[key] = _add_taken(target.get(key), taken)
+
+        for name, (line, hits) in other.functions.items():
+            entry = self.functions.setdefault(name, [line, 0])
+            if entry[0] is None:
+                entry[0] = line
+            entry[1] += hits
+
+    def record(self) -> _LcovRecord:
+        """Return file totals recomputed from the detail data.
+
+        Used for merged tracefiles, whose ``LF``/``LH``-style summary lines
+        no longer apply.
+        """
+
+        record = _LcovRecord(self.sf)
+        record.lines_total_da = len(self.lines)
+        record.lines_hit_da = sum(1 for hits in self.lines.values() if hits > 0)
+        record.functions_total = len(self.functions)
+        record.functions_hit = sum(1 for _, hits in self.functions.values() if hits > 0)
+        for branches in self.branches.values():
+            record.branches_total += len(branches)
+            record.branches_hit += sum(1 for taken in branches.values() if taken)
+        return record.finalize()
+
+
+def _parse_lcov_detail(
+    info_path: pathlib.Path,
+    *,
+    lines: bool = True,
+    functions: bool = True,
+    part: int = 0,
+    parts: int = 1,
+) -> Iterator[_LcovDetail]:
+    """Yield the DA/BRDA (*lines*) and FN/FNDA (*functions*) data of each record.
+
+    Lines that are malformed for :func:`_parse_lcov_blocks` are skipped the
+    same way here, so every record it yields has a detail counterpart. With
+    *parts* > 1, only records whose SF path hashes to *part* are yielded.
+    """
+
+    current: _LcovDetail | None = None
+    index = -1
+
+    with info_path.open("rb") as info_file:
+        for block in _lcov_line_blocks(info_file):
+            for line in block:
+                # Outside a record (or inside another part's) only SF lines matter.
+                if current is None and b"SF:" not in line:
+                    continue
+                line = line.strip()
+                if not line:
+                    continue
+
+                if line[:3] == b"DA:":
+                    if lines and current is not None:
+                        number, comma, rest = line[3:].partition(b",")
+                        if comma:
+                            number = int(number)
+                            current.lines[number] = current.lines.get(number, 0) + int(
+                                rest.partition(b",")[0]
+                            )
+                    continue
+
+                if line[:5] == b"BRDA:":
+                    if lines and current is not None:
+                        fields = line[5:].split(b",")
+                        if len(fields) == 4:
+                            taken = None if fields[3] == b"-" else int(fields[3])
+                            branches = current.branches.setdefault(int(fields[0]), {})
+                            key = (fields[1], fields[2])
+                            branches[key] = _add_taken(branches.get(key), taken)
+                    continue
+
+                if line.startswith(b"SF:"):
+                    if current is not None:
+                        yield current
+                    index += 1
+                    sf = line.decode("utf-8", errors="ignore").strip()[3:]
+                    if parts > 1 and zlib.crc32(sf.encode("utf-8")) % parts != part:
+                        current = None
+                    else:
+                        current = _LcovDetail(sf, index)
+                    continue
+
+                if current is None:
+                    continue
+
+                if line.startswith(b"FN:"):
+                    if functions:
+                        number, comma, name = line[3:].partition(b",")
+                        if comma:
+                            entry = current.functions.setdefault(name, [None, 0])
+                            if entry[0] is None:
+                                entry[0] = int(number)
+                elif line.startswith(b"FNDA:"):
+                    if functions:
+                        count, comma, name = line[5:].partition(b",")
+                        if comma:
+                            current.functions.setdefault(name, [None, 0])[1] += int(count)
+                elif line == b"end_of_record":
+                    yield current
+                    current = None
+
+    if current is not None:
+        yield current
+
+
+def encode_line_states(lines: dict[int, int]) -> tuple[int | None, str]:
+    """Run-length encode DA hits as ``(first_line, states)``.
+
+    *states* covers every line from *first_line* to the last instrumented
+    line as runs like ``3h1m12n2h``, where ``h``/``m`` are hit and missed
+    lines and ``n`` are lines without a ``DA`` entry.
+    """
+
+    runs: list[str] = []
+    state = ""
+    length = 0
+    previous: int | None = None
+
+    for number in sorted(lines):
+        current = LINE_HIT if lines[number] > 0 else LINE_MISSED
+        if previous is not None and number > previous + 1:
+            runs.append(f"{length}{state}")
+            state, length = LINE_NOT_INSTRUMENTED, number - previous - 1
+        if current == state:
+            length += 1
+        else:
+            if length:
+                runs.append(f"{length}{state}")
+            state, length = current, 1
+        previous = number
+
+    if length:
+        runs.append(f"{length}{state}")
+    return (min(lines) if lines else None), "".join(runs)
+
+
+def decode_line_states(first_line: int, states: str) -> Iterator[tuple[int, str]]:
+    """Yield ``(line, state)`` for each instrumented line of :func:`encode_line_states` output."""
+
+    number = first_line
+    length = 0
+    for char in states:
+        if char.isdigit():
+            length = length * 10 + int(char)
+            continue
+        if char != LINE_NOT_INSTRUMENTED:
+            for offset in range(length):
+                yield number + offset, char
+        number += length
+        length = 0
+
+
+def _branch_state(taken: int | None) -> str:
+    if taken is None:
+        return LINE_NOT_INSTRUMENTED
+    return LINE_HIT if taken > 0 else LINE_MISSED
+
+
+def encode_branch_states(
+    branches: dict[int, dict[tuple[bytes, bytes], int | None]],
+) -> str:
+    """Encode BRDA data as ``line:states`` groups, e.g. ``12:hm;30:hhmn``."""
+
+    return ";".join(
+        f"{number}:{''.join(_branch_state(taken) for taken in branches[number].values())}"
+        for number in sorted(branches)
+    )
 
-            if line.startswith("FNDA:"):
-                _, rest = line.split(":", 1)
-                parts = rest.split(",", 1)
-                if len(parts) == 2:
-                    count_str, name = parts
-                    current["fn_names"].add(name)
-                    if int(count_str) > 0:
-                        current["fn_hit"].add(name)
-                continue
 
-            if line.startswith("FNF:"):
-                _, value = line.split(":", 1)
-                if current["functions_total"] == 0:
-                    current["functions_total"] = int(value)
-                continue
+def lcov_parser() -> str:
+    """Return the lcov parser selected by FITS_LCOV_PARSER (default ``fast``)."""
 
-            if line.startswith("FNH:"):
-                _, value = line.split(":", 1)
-                if current["functions_hit"] == 0:
-                    current["functions_hit"] = int(value)
-                continue
+    value = (os.environ.get(LCOV_PARSER_ENV_VAR) or LCOV_PARSERS[0]).lower()
+    if value not in LCOV_PARSERS:
+        choices = ", ".join(LCOV_PARSERS)
+        raise ValueError(f"{LCOV_PARSER_ENV_VAR} must be one of: {choices}")
+    return value
 
-            if line.startswith("BRDA:"):
-                _, rest = line.split(":", 1)
-                parts = rest.split(",")
-                if len(parts) == 4:
-                    taken = parts[3]
-                    current["branches_total"] += 1
-                    if taken != "-" and int(taken) > 0:
-                        current["branches_hit"] += 1
-                continue
 
-            if line.startswith("BRF:"):
-                _, value = line.split(":", 1)
-                if current["branches_total"] == 0:
-                    current["branches_total"] = int(value)
-                continue
+def _parse_lcov(info_path: pathlib.Path, parser: str | None = None) -> Iterator[_LcovRecord]:
+    """Yield per-source coverage metrics from an lcov .info file.
 
-            if line.startswith("BRH:"):
-                _, value = line.split(":", 1)
-                if current["branches_hit"] == 0:
-                    current["branches_hit"] = int(value)
-                continue
+    Records are yielded as soon as their ``end_of_record`` (or the next ``SF:``)
+    is reached, so memory use does not grow with the number of source files.
+    *parser* is ``fast`` or ``reference`` and defaults to :func:`lcov_parser`.
+    """
+
+    if (parser or lcov_parser()) == "reference":
+        with info_path.open("r", encoding="utf-8", errors="ignore") as info_file:
+            yield from _parse_lcov_lines(info_file)
+        return
+
+    with info_path.open("rb") as info_file:
+        yield from _parse_lcov_blocks(_lcov_line_blocks(info_file))
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of ``[start, end)`` bytes of an open binary file."""
 
-            if line == "end_of_record":
-                finalize_current()
+    def __init__(self, handle: BinaryIO, start: int, end: int) -> None:
+        handle.seek(start)
+        self._handle = handle
+        self._remaining = end - start
 
-    finalize_current()
-    return files
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._handle.read(size)
+        buffer[: len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def _lcov_shards(info_path: pathlib.Path, count: int) -> list[tuple[int, int]]:
+    """Split an lcov file into byte ranges that each start at an ``SF:`` line."""
+
+    size = info_path.stat().st_size
+    boundaries = [0]
+    with info_path.open("rb") as info_file:
+        for index in range(1, count):
+            target = size * index // count
+            if target <= boundaries[-1]:
+                continue
+            info_file.seek(target - 1)
+            info_file.readline()
+            while True:
+                position = info_file.tell()
+                raw = info_file.readline()
+                if not raw:
+                    position = size
+                    break
+                if raw.decode("utf-8", errors="ignore").strip().startswith("SF:"):
+                    break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(size)
+
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start
+    ]
+
+
+def _parse_lcov_range(
+    info_path: pathlib.Path, start: int, end: int, parser: str
+) -> list[_LcovRecord]:
+    """Parse the records contained in one shard of an lcov file."""
+
+    with info_path.open("rb") as info_file:
+        shard = _ByteRange(info_file, start, end)
+        if parser != "reference":
+            return list(_parse_lcov_blocks(_lcov_line_blocks(shard)))
+        text = io.TextIOWrapper(
+            io.BufferedReader(shard), encoding="utf-8", errors="ignore"
+        )
+        return list(_parse_lcov_lines(text))
+
+
+def _parse_lcov_parallel(
+    info_path: pathlib.Path, jobs: int, parser: str | None = None
+) -> Iterator[_LcovRecord]:
+    """Parse an lcov file across *jobs* worker processes.
+
+    The file is split into more shards than workers to balance uneven record
+    sizes; shard results are yielded in file order so the output matches
+    :func:`_parse_lcov` exactly.
+    """
+
+    parser = parser or lcov_parser()
+    shards = _lcov_shards(info_path, jobs * LCOV_SHARDS_PER_JOB)
+    if len(shards) <= 1:
+        yield from _parse_lcov(info_path, parser)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        starts = [start for start, _ in shards]
+        ends = [end for _, end in shards]
+        for records in executor.map(
+            _parse_lcov_range,
+            [info_path] * len(shards),
+            starts,
+            ends,
+            [parser] * len(shards),
+        ):
+            yield from records
+
+
+def _merge_lcov_part(
+    info_paths: Sequence[pathlib.Path],
+    part: int,
+    parts: int,
+    convert: Callable[[_LcovDetail], T],
+    lines: bool,
+    functions: bool,
+) -> list[tuple[tuple[int, int], T]]:
+    """Merge this part's SF records across all tracefiles and convert them.
+
+    Returns ``((file index, record index), convert(record))`` pairs ordered by
+    where each SF path first appeared.
+    """
+
+    merged: dict[str, _LcovDetail] = {}
+    first_seen: dict[str, tuple[int, int]] = {}
+    for file_index, info_path in enumerate(info_paths):
+        details = _parse_lcov_detail(
+            info_path, lines=lines, functions=functions, part=part, parts=parts
+        )
+        for detail in details:
+            existing = merged.get(detail.sf)
+            if existing is None:
+                merged[detail.sf] = detail
+                first_seen[detail.sf] = (file_index, detail.index)
+            else:
+                existing.merge(detail)
+
+    return [(first_seen[sf], convert(merged.pop(sf))) for sf in list(merged)]
+
+
+def _merge_lcov(
+    info_paths: Sequence[pathlib.Path],
+    jobs: int,
+    convert: Callable[[_LcovDetail], T],
+    *,
+    lines: bool = True,
+    functions: bool = True,
+) -> Iterator[T]:
+    """Merge several tracefiles the way ``lcov -a`` does and convert each record.
+
+    Records for the same SF path are combined, within and across files: DA
+    hits and BRDA taken counts are summed per line and branch, and FN/FNDA
+    functions are united with their hits summed. With *jobs* > 1, SF paths
+    are hash-partitioned across worker processes; every worker reads all
+    files but only merges its own records and returns them already
+    converted, so little data crosses process boundaries. Results come out
+    in the order their SF path first appears, whatever *jobs* is, which is
+    why nothing is yielded until every file has been read: the merge holds
+    all merged records in memory and does not stream. *convert* must be a
+    module-level function so it can be sent to workers.
+    """
+
+    info_paths = list(info_paths)
+    if jobs <= 1:
+        merged = [_merge_lcov_part(info_paths, 0, 1, convert, lines, functions)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            merged = list(
+                executor.map(
+                    _merge_lcov_part,
+                    [info_paths] * jobs,
+                    range(jobs),
+                    [jobs] * jobs,
+                    [convert] * jobs,
+                    [lines] * jobs,
+                    [functions] * jobs,
+                )
+            )
+
+    for _, item in heapq.merge(*merged, key=operator.itemgetter(0)):
+        yield item
 
 
 def _load_module_mapping(config_dir: pathlib.Path) -> list[tuple[str, str, str | None]]:
@@ -252,55 +869,244 @@ def _load_override_mapping(
     return overrides
 
 
+def _index_module_mapping(
+    mapping: list[tuple[str, str, str | None]],
+) -> dict[str, tuple[str, str | None]]:
+    """Index directory mappings by normalized directory for prefix lookups.
+
+    When a directory appears more than once, the first row wins, matching the
+    order-sensitive behaviour of a linear scan.
+    """
+
+    index: dict[str, tuple[str, str | None]] = {}
+    for mapped_dir, module, owner in mapping:
+        index.setdefault(mapped_dir.strip("/"), (module, owner))
+    return index
+
+
 def _module_owner_for_directory(
-    directory: str, mapping: list[tuple[str, str, str | None]]
+    directory: str, index: dict[str, tuple[str, str | None]]
 ) -> tuple[str | None, str | None]:
-    """Return the closest module/owner mapping for a directory."""
+    """Return the closest module/owner mapping for a directory.
 
-    normalized = directory.strip("/").replace("\\", "/")
-    best: tuple[str, str, str | None] | None = None
+    Candidate prefixes are tried from the full directory upwards one path
+    segment at a time, so the longest mapped directory wins and the cost is
+    bounded by the path depth rather than the mapping size.
+    """
 
-    for mapped_dir, module, owner in mapping:
-        mapped_normalized = mapped_dir.strip("/")
-        if normalized == mapped_normalized or normalized.startswith(mapped_normalized + "/"):
-            if best is None or len(mapped_normalized) > len(best[0]):
-                best = (mapped_normalized, module, owner)
+    candidate = directory.strip("/").replace("\\", "/")
 
-    if best:
-        return best[1], best[2]
+    while True:
+        match = index.get(candidate)
+        if match is not None:
+            return match
+        cut = candidate.rfind("/")
+        if cut == -1:
+            return None, None
+        candidate = candidate[:cut]
 
-    return None, None
+
+def _index_override_mapping(
+    overrides: list[tuple[str, str, str, str | None]],
+) -> dict[tuple[str, str], tuple[str, str | None]]:
+    """Index override rows by normalized ``(directory, file_name)``.
+
+    If the overrides file lists the same directory and file more than once,
+    the first row in the file takes precedence and later duplicates are
+    ignored.
+    """
+
+    index: dict[tuple[str, str], tuple[str, str | None]] = {}
+    for mapped_dir, mapped_file, module, owner in overrides:
+        index.setdefault((mapped_dir.strip("/"), mapped_file), (module, owner))
+    return index
 
 
 def _override_for_file(
-    directory: str, file_name: str, overrides: list[tuple[str, str, str, str | None]]
+    directory: str,
+    file_name: str,
+    overrides: dict[tuple[str, str], tuple[str, str | None]],
 ) -> tuple[str | None, str | None]:
     """Return override module/owner if a directory+file_name mapping exists."""
 
     normalized_dir = directory.strip("/").replace("\\", "/")
     normalized_file = file_name or ""
 
-    for mapped_dir, mapped_file, module, owner in overrides:
-        if normalized_dir == mapped_dir.strip("/") and normalized_file == mapped_file:
-            return module, owner
+    return overrides.get((normalized_dir, normalized_file), (None, None))
 
-    return None, None
+
+@functools.lru_cache(maxsize=4)
+def _load_mapping_indexes(
+    config_dir: pathlib.Path, stamps: tuple[object, ...]
+) -> tuple[
+    dict[str, tuple[str, str | None]],
+    dict[tuple[str, str], tuple[str, str | None]],
+]:
+    return (
+        _index_module_mapping(_load_module_mapping(config_dir)),
+        _index_override_mapping(_load_override_mapping(config_dir)),
+    )
+
+
+def _mapping_indexes(
+    config_dir: pathlib.Path,
+) -> tuple[
+    dict[str, tuple[str, str | None]],
+    dict[tuple[str, str], tuple[str, str | None]],
+]:
+    """Return the indexed module and override mappings for *config_dir*.
+
+    Indexes are kept per process and reloaded only when either mapping file
+    changes size or mtime, so batch runs parse the mapping CSVs once.
+    """
+
+    stamps = (
+        file_stamp(config_dir / COVERAGE_MAPPING_FILE),
+        file_stamp(config_dir / COVERAGE_MAPPING_OVERRIDES_FILE),
+    )
+    return _load_mapping_indexes(config_dir, stamps)
 
 
-def _build_rows(context: RunContext) -> Iterator[dict[str, str | int | None]]:
-    """Yield coverage rows enriched with module and owner metadata."""
+def preload_coverage_mappings() -> None:
+    """Load the coverage mapping indexes for the current directory up front."""
 
-    info_path = _resolve_info_path(context)
-    config_dir = pathlib.Path.cwd() / "FITS"
-    mapping = _load_module_mapping(config_dir)
-    overrides = _load_override_mapping(config_dir)
-    parsed = _parse_lcov(info_path)
+    _mapping_indexes(checkout_dir())
 
-    for record in parsed:
-        module, owner = _module_owner_for_directory(str(record["directory"]), mapping)
+
+class _CoverageSnapshot:
+    """Per-file coverage values from the last fully uploaded run.
+
+    The snapshot is rebuilt in the database as "every row the current run
+    uploaded for a ``(directory, file_name)`` key, otherwise the base run's
+    rows for that key". :meth:`diff` therefore only skips a file when it is
+    reported exactly once, unchanged, in both runs; if a skipped key shows up
+    again later in the tracefile, its skipped row is emitted after all.
+    """
+
+    def __init__(
+        self, base_exec_id: str, files: dict[tuple[str, str], list[tuple[str, ...]]]
+    ) -> None:
+        self.base_exec_id = base_exec_id
+        self.files = files
+        # key -> values of the row skipped for it, or None once rows were emitted.
+        self._seen: dict[tuple[str, str], tuple[str, ...] | None] = {}
+
+    def diff(
+        self, key: tuple[str, str], values: tuple[str, ...]
+    ) -> tuple[list[tuple[str, ...]], bool]:
+        """Return ``(late_rows, emit)`` for a file reported by the current run.
+
+        ``late_rows`` holds previously skipped values that must now be
+        emitted; ``emit`` tells whether the current row itself is needed.
+        """
+
+        if key in self._seen:
+            skipped = self._seen[key]
+            self._seen[key] = None
+            return ([skipped] if skipped is not None else []), True
+
+        if self.files.get(key) == [values]:
+            self._seen[key] = values
+            return [], False
+
+        self._seen[key] = None
+        return [], True
+
+    def removed(self) -> Iterator[tuple[str, str]]:
+        """Yield snapshot keys the current run did not report at all."""
+
+        for key in self.files:
+            if key not in self._seen:
+                yield key
+
+
+def _load_snapshot(path: pathlib.Path) -> _CoverageSnapshot | None:
+    """Load a coverage snapshot written by :func:`update_coverage_snapshot`."""
+
+    if not path.exists():
+        return None
+
+    base_exec_id: str | None = None
+    files: dict[tuple[str, str], list[tuple[str, ...]]] = {}
+    with open_artifact(path) as snapshot_file:
+        for row in csv.DictReader(snapshot_file):
+            base_exec_id = row["exec_id"]
+            files.setdefault((row["directory"], row["file_name"]), []).append(
+                tuple(row[column] for column in SNAPSHOT_VALUE_COLUMNS)
+            )
+
+    if base_exec_id is None:
+        return None
+    return _CoverageSnapshot(base_exec_id, files)
+
+
+def _parse_records(
+    context: RunContext, info_paths: Sequence[pathlib.Path]
+) -> Iterable[_LcovRecord]:
+    if len(info_paths) > 1:
+        return timed(
+            "lcov_parse", _merge_lcov(info_paths, context.jobs, _detail_record)
+        )
+    if context.jobs > 1:
+        return timed("lcov_parse", _parse_lcov_parallel(info_paths[0], context.jobs))
+    return timed("lcov_parse", _parse_lcov(info_paths[0]))
+
+
+def _detail_record(detail: _LcovDetail) -> _LcovRecord:
+    return detail.record()
+
+
+def _detail_rows(
+    detail: _LcovDetail,
+) -> tuple[str, int | None, str, str, list[tuple[str, int | None, int]]]:
+    first_line, line_states = encode_line_states(detail.lines)
+    functions = [
+        (name.decode("utf-8", errors="ignore"), line, hits)
+        for name, (line, hits) in detail.functions.items()
+    ]
+    return (
+        detail.sf,
+        first_line,
+        line_states,
+        encode_branch_states(detail.branches),
+        functions,
+    )
+
+
+def _lcov_details(
+    context: RunContext,
+    info_paths: Sequence[pathlib.Path],
+    convert: Callable[[_LcovDetail], T],
+) -> Iterable[T]:
+    """Yield *convert* applied to each record's detail data, merging multiple files."""
+
+    if len(info_paths) > 1:
+        details = _merge_lcov(info_paths, context.jobs, convert)
+    else:
+        details = map(convert, _parse_lcov_detail(info_paths[0]))
+    return timed("lcov_detail_parse", details)
+
+
+def _enriched_rows(
+    context: RunContext,
+    info_paths: Sequence[pathlib.Path],
+    config_dir: pathlib.Path,
+    records: Iterable[_LcovRecord] | None = None,
+) -> Iterator[dict[str, str | int | None]]:
+    """Parse *info_paths* and attach module and owner metadata to each file.
+
+    Already parsed *records* are used instead of parsing again when given.
+    """
+
+    mapping, overrides = _mapping_indexes(config_dir)
+    if records is None:
+        records = _parse_records(context, info_paths)
+
+    for record in records:
+        module, owner = _module_owner_for_directory(record.directory, mapping)
         override_module, override_owner = _override_for_file(
-            str(record["directory"]),
-            str(record["file_name"]),
+            record.directory,
+            record.file_name,
             overrides,
         )
         if override_module is not None:
@@ -308,37 +1114,247 @@ def _build_rows(context: RunContext) -> Iterator[dict[str, str | int | None]]:
             owner = override_owner
         yield {
             "exec_id": context.exec_id,
-            "directory": record["directory"],
-            "file_name": record["file_name"],
-            "lines_hit": record["lines_hit"],
-            "lines_total": record["lines_total"],
-            "functions_hit": record["functions_hit"],
-            "functions_total": record["functions_total"],
-            "branches_hit": record["branches_hit"],
-            "branches_total": record["branches_total"],
+            "directory": record.directory,
+            "file_name": record.file_name,
+            "lines_hit": record.lines_hit,
+            "lines_total": record.lines_total,
+            "functions_hit": record.functions_hit,
+            "functions_total": record.functions_total,
+            "branches_hit": record.branches_hit,
+            "branches_total": record.branches_total,
             "module": module,
             "owner": owner,
         }
 
 
+def _build_rows(
+    context: RunContext,
+    snapshot: _CoverageSnapshot | None = None,
+    info_paths: Sequence[pathlib.Path] | None = None,
+) -> Iterator[dict[str, str | int | None]]:
+    """Yield coverage rows enriched with module and owner metadata.
+
+    Rows are replayed from the parse cache when the tracefile and mapping
+    files are unchanged. With a *snapshot*, rows whose values match the
+    snapshot are skipped so only new and changed files are emitted.
+    """
+
+    info_paths = info_paths or _resolve_info_paths(context)
+    config_dir = checkout_dir()
+    cache = context_cache(context)
+
+    # Entries are keyed by tracefiles first so a likely hit can be spotted
+    # before the mapping files are available.
+    inputs_key = cache.key("coverage", info_paths) if cache else None
+    records = None
+    if configs_pending() and not (cache and cache.has_children(inputs_key)):
+        # Parse while the config checkout is still being fetched; the cache
+        # key and the enrichment both need the mapping files.
+        records = list(_parse_records(context, info_paths))
+    wait_for_configs()
+
+    rows = cached_rows(
+        cache,
+        lambda: cache.child_key(
+            inputs_key,
+            "coverage_mapping",
+            [
+                config_dir / COVERAGE_MAPPING_FILE,
+                config_dir / COVERAGE_MAPPING_OVERRIDES_FILE,
+            ],
+        ),
+        COVERAGE_RESULTS_HEADERS,
+        context.exec_id,
+        lambda: timed(
+            "coverage_enrich", _enriched_rows(context, info_paths, config_dir, records)
+        ),
+    )
+
+    for row in rows:
+        if snapshot is None:
+            yield row
+            continue
+
+        key = (row["directory"], row["file_name"])
+        late_rows, emit = snapshot.diff(
+            key,
+            tuple(
+                "" if row[column] is None else str(row[column])
+                for column in SNAPSHOT_VALUE_COLUMNS
+            ),
+        )
+        for values in late_rows:
+            yield {
+                "exec_id": context.exec_id,
+                "directory": row["directory"],
+                "file_name": row["file_name"],
+                **{
+                    column: value or None
+                    for column, value in zip(SNAPSHOT_VALUE_COLUMNS, values)
+                },
+            }
+        if emit:
+            yield row
+
+
+def _line_rows(
+    context: RunContext, info_paths: Sequence[pathlib.Path], spool: IO[str]
+) -> Iterator[dict[str, str | int | None]]:
+    """Yield one ``coverage_lines`` row per tracefile record.
+
+    The same pass writes each record's functions to *spool* for
+    :func:`_function_rows`, so tracefiles are only read once.
+    """
+
+    functions_writer = csv.writer(spool)
+    details = _lcov_details(context, info_paths, _detail_rows)
+    for sf, first_line, line_states, branch_states, functions in details:
+        directory, file_name = _split_directory_and_filename(sf)
+        yield {
+            "exec_id": context.exec_id,
+            "directory": directory,
+            "file_name": file_name,
+            "first_line": first_line,
+            "line_states": line_states,
+            "branch_states": branch_states,
+        }
+        functions_writer.writerows(
+            (directory, file_name, name, "" if line is None else line, hits)
+            for name, line, hits in functions
+        )
+
+
+def _function_rows(
+    context: RunContext, spool: IO[str]
+) -> Iterator[dict[str, str | int | None]]:
+    """Yield the ``coverage_functions`` rows :func:`_line_rows` spooled.
+
+    Must be consumed after the ``coverage_lines`` rows, which is the order
+    artifacts are written in.
+    """
+
+    with spool:
+        spool.seek(0)
+        for directory, file_name, name, line, hits in csv.reader(spool):
+            yield {
+                "exec_id": context.exec_id,
+                "directory": directory,
+                "file_name": file_name,
+                "function": name,
+                "line": int(line) if line else None,
+                "hits": int(hits),
+            }
+
+
+def _removed_rows(
+    context: RunContext, snapshot: _CoverageSnapshot
+) -> Iterator[dict[str, str]]:
+    """Yield snapshot files that the current run no longer reports.
+
+    Must be consumed after the ``coverage_results`` rows, which is the order
+    artifacts are written in.
+    """
+
+    for directory, file_name in snapshot.removed():
+        yield {"exec_id": context.exec_id, "directory": directory, "file_name": file_name}
+
+
+def update_coverage_snapshot(
+    context: RunContext, uploads: Iterable[TableUpload]
+) -> None:
+    """Store a full run's uploaded ``coverage_results`` as the new snapshot.
+
+    Incremental runs leave the snapshot alone so later runs keep diffing
+    against the same full base execution, and so do test uploads, whose
+    exec_id ``v_latest_branches_coverage_results`` never reports.
+    """
+
+    if context.coverage_snapshot is None or is_test_exec_id(context.exec_id):
+        return
+
+    paths = {upload.table: upload.path for upload in uploads}
+    if COVERAGE_INCREMENTS_TABLE in paths or COVERAGE_RESULTS_TABLE not in paths:
+        return
+
+    # The snapshot is written with the codec its suffix names, since that is
+    # how _load_snapshot reads it back.
+    snapshot = context.coverage_snapshot
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    pending = snapshot.with_name(f"{snapshot.stem}.tmp{snapshot.suffix}")
+    source_path = paths[COVERAGE_RESULTS_TABLE]
+    if source_path.suffix == snapshot.suffix:
+        shutil.copyfile(source_path, pending)
+    else:
+        with open_artifact(source_path, binary=True) as source:
+            with open_artifact(pending, "w", binary=True) as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+    pending.replace(snapshot)
+
+
 def build_coverage_artifacts(context: RunContext) -> Iterable[CsvArtifact]:
-    """Construct coverage CSV artifacts for upload."""
+    """Construct coverage CSV artifacts for upload.
+
+    When ``context.coverage_snapshot`` points at an existing snapshot, only
+    changed files are emitted, together with the removed files and a
+    ``coverage_increments`` row referencing the snapshot's base execution.
+    With ``context.coverage_detail``, full ``coverage_lines`` and
+    ``coverage_functions`` artifacts follow.
+    """
+
+    snapshot = (
+        _load_snapshot(context.coverage_snapshot) if context.coverage_snapshot else None
+    )
+    database = context.db_config.database
+    # Resolved once up front so every artifact reads the same tracefiles.
+    info_paths = _resolve_info_paths(context) if context.coverage_detail else None
 
     yield CsvArtifact(
-        name=build_artifact_name(context.db_config.database, COVERAGE_RESULTS_TABLE),
-        headers=[
-            "exec_id",
-            "directory",
-            "file_name",
-            "lines_hit",
-            "lines_total",
-            "functions_hit",
-            "functions_total",
-            "branches_hit",
-            "branches_total",
-            "module",
-            "owner",
-        ],
-        rows=_build_rows(context),
+        name=build_artifact_name(database, COVERAGE_RESULTS_TABLE),
+        headers=COVERAGE_RESULTS_HEADERS,
+        rows=_build_rows(context, snapshot, info_paths),
         table=COVERAGE_RESULTS_TABLE,
+        column_types={
+            "exec_id": "int64",
+            "lines_hit": "int64",
+            "lines_total": "int64",
+            "functions_hit": "int64",
+            "functions_total": "int64",
+            "branches_hit": "int64",
+            "branches_total": "int64",
+        },
+    )
+
+    if info_paths is not None:
+        spool = tempfile.TemporaryFile("w+", encoding="utf-8", newline="")
+        yield CsvArtifact(
+            name=build_artifact_name(database, COVERAGE_LINES_TABLE),
+            headers=COVERAGE_LINES_HEADERS,
+            rows=_line_rows(context, info_paths, spool),
+            table=COVERAGE_LINES_TABLE,
+            column_types={"exec_id": "int64", "first_line": "int64"},
+        )
+        yield CsvArtifact(
+            name=build_artifact_name(database, COVERAGE_FUNCTIONS_TABLE),
+            headers=COVERAGE_FUNCTIONS_HEADERS,
+            rows=_function_rows(context, spool),
+            table=COVERAGE_FUNCTIONS_TABLE,
+            column_types={"exec_id": "int64", "line": "int64", "hits": "int64"},
+        )
+
+    if snapshot is None:
+        return
+
+    yield CsvArtifact(
+        name=build_artifact_name(database, COVERAGE_REMOVED_FILES_TABLE),
+        headers=["exec_id", "directory", "file_name"],
+        rows=_removed_rows(context, snapshot),
+        table=COVERAGE_REMOVED_FILES_TABLE,
+        column_types={"exec_id": "int64"},
+    )
+    yield CsvArtifact(
+        name=build_artifact_name(database, COVERAGE_INCREMENTS_TABLE),
+        headers=["exec_id", "base_exec_id"],
+        rows=[{"exec_id": context.exec_id, "base_exec_id": snapshot.base_exec_id}],
+        table=COVERAGE_INCREMENTS_TABLE,
+        column_types={"exec_id": "int64", "base_exec_id": "int64"},
     )
@@ -1,15 +1,25 @@
 """DTK analysis artifact builders."""
 from __future__ import annotations
 
+import array
+import contextlib
 import csv
+import functools
+import mmap
 import pathlib
 from typing import Iterable, Iterator
 
 from ..artifacts import CsvArtifact, build_artifact_name
+from ..cache import cached_rows, context_cache, file_stamp
 from ..config import RunContext
+from ..configs import checkout_dir, configs_pending, wait_for_configs
+from ..metrics import stage, timed
 
 
 DTK_RESULTS_TABLE = "dtk_results"
+DTK_RESULTS_HEADERS = ["exec_id", "case", "module", "owner", "result", "baseline"]
+CASE_TO_MODULE_FILE = "casename-to-module.csv"
+MODULE_TO_OWNER_FILE = "module-to-owner.csv"
 
 
 def _results_path(context: RunContext) -> pathlib.Path:
@@ -56,6 +66,15 @@ def _parse_result_line(line: str) -> tuple[str, str | None]:
     return case, result
 
 
+def _parse_case_line(line: str) -> tuple[str, str | None]:
+    """Parse a DTK result line and strip a trailing ``.jpg`` from the case."""
+
+    case, value = _parse_result_line(line)
+    if case.lower().endswith(".jpg"):
+        case = case[:-4]
+    return case, value
+
+
 def _load_mapping(
     path: pathlib.Path, key_field: str, value_field: str
 ) -> dict[str, str]:
@@ -86,54 +105,102 @@ def _load_mapping(
     return mapping
 
 
-def _module_for_case(case: str, case_to_module: dict[str, str]) -> str | None:
-    case_prefix = case.split("_", 1)[0]
+@functools.lru_cache(maxsize=4)
+def _load_mappings(
+    config_dir: pathlib.Path, stamps: tuple[object, ...]
+) -> tuple[dict[str, str], dict[str, str]]:
+    return (
+        _load_mapping(config_dir / CASE_TO_MODULE_FILE, "casename", "module"),
+        _load_mapping(config_dir / MODULE_TO_OWNER_FILE, "module", "owner"),
+    )
+
+
+def _mappings(config_dir: pathlib.Path) -> tuple[dict[str, str], dict[str, str]]:
+    """Return the case-to-module and module-to-owner mappings for *config_dir*.
+
+    Mappings are kept per process and reloaded only when a mapping file
+    changes size or mtime.
+    """
+
+    stamps = (
+        file_stamp(config_dir / CASE_TO_MODULE_FILE),
+        file_stamp(config_dir / MODULE_TO_OWNER_FILE),
+    )
+    return _load_mappings(config_dir, stamps)
+
+
+def preload_dtk_mappings() -> None:
+    """Load the DTK mappings for the current directory up front."""
+
+    _mappings(checkout_dir())
+
+
+class _CaseModuleResolver:
+    """Resolve DTK case names to module and owner, cached per case prefix."""
+
+    def __init__(
+        self, case_to_module: dict[str, str], module_to_owner: dict[str, str]
+    ) -> None:
+        self._case_to_module = case_to_module
+        self._module_to_owner = module_to_owner
+        self._cache: dict[str, tuple[str | None, str | None]] = {}
+
+    def resolve(self, case: str) -> tuple[str | None, str | None]:
+        case_prefix = case.split("_", 1)[0]
+        cached = self._cache.get(case_prefix)
+        if cached is not None:
+            return cached
 
-    for casename, module in case_to_module.items():
-        if casename == case_prefix:
-            return module
+        module = self._case_to_module.get(case_prefix)
+        owner = self._module_to_owner.get(module) if module else None
+        resolved = (module, owner)
+        self._cache[case_prefix] = resolved
+        return resolved
+
+
+def _read_cases(path: pathlib.Path) -> list[tuple[str, str | None]]:
+    # UTF-8 like the memory-mapped baseline in _stream_results, whatever the locale.
+    with path.open(encoding="utf-8") as results_file:
+        return [_parse_case_line(line) for line in results_file]
+
+
+def _read_inputs(
+    context: RunContext,
+) -> tuple[list[tuple[str, str | None]], list[tuple[str, str | None]]]:
+    """Parse the DTK results and baseline files."""
 
-    return None
+    return _read_cases(_results_path(context)), _read_cases(_baseline_path(context))
 
 
 def _read_results(
     context: RunContext,
     case_to_module: dict[str, str],
     module_to_owner: dict[str, str],
+    inputs: tuple[
+        list[tuple[str, str | None]], list[tuple[str, str | None]]
+    ] | None = None,
 ) -> Iterator[dict[str, str | None]]:
     """Yield parsed DTK results with optional baseline values.
 
     Case names ending with ``.jpg`` have the suffix removed so image artifacts
-    are normalized to their associated case names.
+    are normalized to their associated case names. Already parsed *inputs*
+    from :func:`_read_inputs` are used instead of reading the files again.
     """
 
-    results_path = _results_path(context)
-    baseline_path = _baseline_path(context)
-
-    def _read_cases(path: pathlib.Path) -> list[tuple[str, str | None]]:
-        cases: list[tuple[str, str | None]] = []
-        with path.open() as results_file:
-            for line in results_file:
-                case, value = _parse_result_line(line)
-                if case.lower().endswith(".jpg"):
-                    case = case[:-4]
-                cases.append((case, value))
-        return cases
-
-    results = _read_cases(results_path)
-    baselines = _read_cases(baseline_path)
+    resolver = _CaseModuleResolver(case_to_module, module_to_owner)
+    results, baselines = inputs or _read_inputs(context)
 
     baseline_lookup = {case: value for case, value in baselines}
     seen: set[str] = set()
 
     for case, result in results:
         seen.add(case)
-        module = _module_for_case(case, case_to_module)
+        module, owner = resolver.resolve(case)
         yield {
             "exec_id": context.exec_id,
             "case": case,
             "module": module,
-            "owner": module_to_owner.get(module) if module else None,
+            "owner": owner,
             "result": result,
             "baseline": baseline_lookup.get(case),
         }
@@ -141,27 +208,159 @@ def _read_results(
     for case, baseline in baselines:
         if case in seen:
             continue
-        module = _module_for_case(case, case_to_module)
+        module, owner = resolver.resolve(case)
         yield {
             "exec_id": context.exec_id,
             "case": case,
             "module": module,
-            "owner": module_to_owner.get(module) if module else None,
+            "owner": owner,
             "result": None,
             "baseline": baseline,
         }
 
 
+def _iter_mapped_lines(buffer: mmap.mmap) -> Iterator[tuple[int, str]]:
+    """Yield ``(offset, line)`` pairs from a memory-mapped text file."""
+
+    size = len(buffer)
+    start = 0
+    while start < size:
+        end = buffer.find(b"\n", start)
+        if end == -1:
+            end = size
+        yield start, buffer[start:end].decode("utf-8")
+        start = end + 1
+
+
+def _stream_results(
+    context: RunContext,
+    case_to_module: dict[str, str],
+    module_to_owner: dict[str, str],
+) -> Iterator[dict[str, str | None]]:
+    """Yield the same rows as :func:`_read_results` without loading both files.
+
+    The baseline is memory-mapped and indexed once as ``case -> key id`` with
+    an array holding the byte offset of each case's last baseline line, so
+    baseline values are only decoded when a result row needs them. Result
+    lines are streamed straight from disk, keeping peak memory proportional
+    to the number of unique baseline cases rather than the size of either
+    file.
+    """
+
+    results_path = _results_path(context)
+    baseline_path = _baseline_path(context)
+    resolver = _CaseModuleResolver(case_to_module, module_to_owner)
+
+    with contextlib.ExitStack() as stack:
+        baseline_file = stack.enter_context(baseline_path.open("rb"))
+        if baseline_path.stat().st_size:
+            buffer = stack.enter_context(
+                mmap.mmap(baseline_file.fileno(), 0, access=mmap.ACCESS_READ)
+            )
+        else:
+            buffer = None
+
+        key_ids: dict[str, int] = {}
+        offsets = array.array("q")
+        if buffer is not None:
+            for offset, line in _iter_mapped_lines(buffer):
+                case, _ = _parse_case_line(line)
+                key_id = key_ids.setdefault(case, len(offsets))
+                if key_id == len(offsets):
+                    offsets.append(offset)
+                else:
+                    offsets[key_id] = offset
+        seen = bytearray(len(offsets))
+
+        def _baseline_value(key_id: int) -> str | None:
+            start = offsets[key_id]
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                end = len(buffer)
+            return _parse_case_line(buffer[start:end].decode("utf-8"))[1]
+
+        with results_path.open(encoding="utf-8") as results_file:
+            for line in results_file:
+                case, result = _parse_case_line(line)
+                key_id = key_ids.get(case)
+                baseline = None
+                if key_id is not None:
+                    seen[key_id] = 1
+                    baseline = _baseline_value(key_id)
+                module, owner = resolver.resolve(case)
+                yield {
+                    "exec_id": context.exec_id,
+                    "case": case,
+                    "module": module,
+                    "owner": owner,
+                    "result": result,
+                    "baseline": baseline,
+                }
+
+        if buffer is None:
+            return
+
+        for _, line in _iter_mapped_lines(buffer):
+            case, baseline = _parse_case_line(line)
+            if seen[key_ids[case]]:
+                continue
+            module, owner = resolver.resolve(case)
+            yield {
+                "exec_id": context.exec_id,
+                "case": case,
+                "module": module,
+                "owner": owner,
+                "result": None,
+                "baseline": baseline,
+            }
+
+
 def build_dtk_artifacts(context: RunContext) -> Iterable[CsvArtifact]:
     """Construct a DTK CSV with execution id, case name, and result."""
 
-    config_dir = pathlib.Path.cwd() / "FITS"
-    case_to_module = _load_mapping(config_dir / "casename-to-module.csv", "casename", "module")
-    module_to_owner = _load_mapping(config_dir / "module-to-owner.csv", "module", "owner")
+    config_dir = checkout_dir()
+    cache = context_cache(context)
+    inputs_key = (
+        cache.key("dtk", [_results_path(context), _baseline_path(context)])
+        if cache
+        else None
+    )
+    inputs = None
+    if (
+        configs_pending()
+        and not context.stream_join
+        and not (cache and cache.has_children(inputs_key))
+    ):
+        # Parse while the config checkout is still being fetched.
+        with stage("dtk_parse"):
+            inputs = _read_inputs(context)
+    wait_for_configs()
+    case_to_module, module_to_owner = _mappings(config_dir)
+
+    def read_rows():
+        if context.stream_join:
+            rows = _stream_results(context, case_to_module, module_to_owner)
+        else:
+            rows = _read_results(context, case_to_module, module_to_owner, inputs)
+        return timed("dtk_join", rows)
+
+    rows = cached_rows(
+        cache,
+        lambda: cache.child_key(
+            inputs_key,
+            "dtk_mapping",
+            [config_dir / CASE_TO_MODULE_FILE, config_dir / MODULE_TO_OWNER_FILE],
+        ),
+        DTK_RESULTS_HEADERS,
+        context.exec_id,
+        read_rows,
+    )
 
     yield CsvArtifact(
         name=build_artifact_name(context.db_config.database, DTK_RESULTS_TABLE),
-        headers=["exec_id", "case", "module", "owner", "result", "baseline"],
-        rows=_read_results(context, case_to_module, module_to_owner),
+        headers=DTK_RESULTS_HEADERS,
+        rows=rows,
         table=DTK_RESULTS_TABLE,
+        # Results and baselines are free text after "#", so they stay strings.
+        column_types={"exec_id": "int64"},
     )
@@ -2,19 +2,33 @@
 from __future__ import annotations
 
 import csv
+import gzip
+import importlib
 import pathlib
-from dataclasses import dataclass
-from typing import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Mapping, Sequence
+
+
+RowSink = Callable[[Mapping[str, object]], None]
+
+COLUMN_TYPES = ("string", "int64", "float64")
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+PARQUET_ROW_GROUP_SIZE = 65536
 
 
 @dataclass
 class CsvArtifact:
-    """Represents a single CSV file to be written and optionally uploaded."""
+    """Represents a single CSV file to be written and optionally uploaded.
+
+    ``column_types`` maps headers to one of :data:`COLUMN_TYPES` for typed
+    output formats; unlisted columns are treated as ``string``.
+    """
 
     name: str
     headers: Sequence[str]
     rows: Iterable[Mapping[str, object]]
     table: str | None = None
+    column_types: Mapping[str, str] = field(default_factory=dict)
 
 
 def build_artifact_name(database: str, table: str) -> str:
@@ -23,13 +37,206 @@ def build_artifact_name(database: str, table: str) -> str:
     return f"fits.db.{database}.{table}.csv"
 
 
-def write_csv(artifact: CsvArtifact, output_dir: pathlib.Path) -> pathlib.Path:
-    """Write a CSV artifact to *output_dir* and return the file path."""
+def parse_artifact_name(name: str) -> tuple[str, str] | None:
+    """Return ``(database, table)`` for a CSV artifact filename, if it is one.
+
+    Compressed artifacts (``.csv.gz``/``.csv.zst``) are recognized as well.
+    """
+
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+
+    prefix, dot, rest = name.partition(".db.")
+    if prefix != "fits" or not dot or not rest.endswith(".csv"):
+        return None
+    database, dot, table = rest[: -len(".csv")].partition(".")
+    if not dot or not database or not table:
+        return None
+    return database, table
+
+
+def _zstandard():
+    try:
+        return importlib.import_module("zstandard")
+    except ImportError:
+        raise ValueError("zstandard is required for .zst artifacts")
+
+
+def is_compressed(path: pathlib.Path) -> bool:
+    """Return True if *path* names a gzip or zstd compressed artifact."""
+
+    return path.suffix in COMPRESSION_SUFFIXES.values()
+
+
+def open_artifact(path: pathlib.Path, mode: str = "r", *, binary: bool = False):
+    """Open a CSV artifact, transparently (de)compressing ``.gz``/``.zst`` files.
+
+    Text mode uses the same ``utf-8-sig`` encoding and newline handling as
+    plain CSV artifacts; ``binary`` returns the raw uncompressed byte stream.
+    """
+
+    text_options = {} if binary else {"encoding": "utf-8-sig", "newline": ""}
+    mode = mode + ("b" if binary else "t")
+
+    if path.suffix == COMPRESSION_SUFFIXES["gzip"]:
+        return gzip.open(path, mode, **text_options)
+    if path.suffix == COMPRESSION_SUFFIXES["zstd"]:
+        return _zstandard().open(path, mode, **text_options)
+    return path.open(mode, **text_options)
+
+
+def write_csv(
+    artifact: CsvArtifact,
+    output_dir: pathlib.Path,
+    *,
+    row_sink: RowSink | None = None,
+    compression: str | None = None,
+) -> pathlib.Path:
+    """Write a CSV artifact to *output_dir* and return the file path.
+
+    When *row_sink* is given, every row is also passed to it right after it
+    is written, letting callers consume the rows in the same pass.
+    ``compression`` (``gzip`` or ``zstd``) streams the file through that
+    codec and appends ``.gz``/``.zst`` to its name.
+    """
+    if compression is not None and compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown artifact compression '{compression}'")
+
     output_dir.mkdir(parents=True, exist_ok=True)
     path = output_dir / artifact.name
-    with path.open("w", newline="", encoding="utf-8-sig") as csv_file:
+    if compression is not None:
+        path = path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+    with open_artifact(path, "w") as csv_file:
         writer = csv.DictWriter(csv_file, fieldnames=list(artifact.headers))
         writer.writeheader()
         for row in artifact.rows:
             writer.writerow(row)
+            if row_sink is not None:
+                row_sink(row)
+    return path
+
+
+def _convert(value: object, column_type: str) -> object:
+    if value is None or value == "":
+        return None
+    if column_type == "int64":
+        return int(value)
+    if column_type == "float64":
+        return float(value)
+    return str(value)
+
+
+class ParquetWriter:
+    """Stream artifact rows into a typed, zstd-compressed Parquet file.
+
+    Rows are buffered column-wise and flushed as row groups of
+    :data:`PARQUET_ROW_GROUP_SIZE` rows. Requires ``pyarrow``.
+    """
+
+    suffix = ".parquet"
+
+    def __init__(self, artifact: CsvArtifact, output_dir: pathlib.Path) -> None:
+        try:
+            pa = importlib.import_module("pyarrow")
+            pq = importlib.import_module("pyarrow.parquet")
+        except ImportError:
+            raise ValueError("pyarrow is required to write parquet artifacts")
+
+        arrow_types = {
+            "string": pa.string(),
+            "int64": pa.int64(),
+            "float64": pa.float64(),
+        }
+        self._pa = pa
+        self._headers = list(artifact.headers)
+        self._types = [
+            artifact.column_types.get(header, "string") for header in self._headers
+        ]
+        unknown = set(self._types) - set(COLUMN_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown column types for {artifact.name}: {sorted(unknown)}")
+
+        self._schema = pa.schema(
+            [
+                (header, arrow_types[column_type])
+                for header, column_type in zip(self._headers, self._types)
+            ]
+        )
+        self.path = output_dir / (pathlib.Path(artifact.name).stem + self.suffix)
+        self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+        self._columns: list[list[object]] = [[] for _ in self._headers]
+
+    def write(self, row: Mapping[str, object]) -> None:
+        for column, header, column_type in zip(self._columns, self._headers, self._types):
+            column.append(_convert(row.get(header), column_type))
+        if len(self._columns[0]) >= PARQUET_ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._columns or not self._columns[0]:
+            return
+        table = self._pa.Table.from_arrays(
+            [
+                self._pa.array(column, type=schema_field.type)
+                for column, schema_field in zip(self._columns, self._schema)
+            ],
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+        self._columns = [[] for _ in self._headers]
+
+    def close(self) -> pathlib.Path:
+        self._flush()
+        self._writer.close()
+        return self.path
+
+
+ARTIFACT_FORMATS = {"csv": None, "parquet": ParquetWriter}
+
+
+def write_artifact(
+    artifact: CsvArtifact,
+    output_dir: pathlib.Path,
+    formats: Sequence[str] = ("csv",),
+    *,
+    row_sink: RowSink | None = None,
+    compression: str | None = None,
+) -> pathlib.Path:
+    """Write the CSV artifact plus any extra *formats* in a single pass.
+
+    The CSV is always written and its path is returned; each additional
+    format from :data:`ARTIFACT_FORMATS` receives the same rows as they are
+    written.
+    """
+
+    unknown = [name for name in formats if name not in ARTIFACT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown artifact formats: {', '.join(unknown)}")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    writers = [
+        ARTIFACT_FORMATS[name](artifact, output_dir)
+        for name in formats
+        if ARTIFACT_FORMATS[name] is not None
+    ]
+    if not writers:
+        return write_csv(
+            artifact, output_dir, row_sink=row_sink, compression=compression
+        )
+
+    sinks = [writer.write for writer in writers]
+    if row_sink is not None:
+        sinks.append(row_sink)
+
+    def _fan_out(row: Mapping[str, object]) -> None:
+        for sink in sinks:
+            sink(row)
+
+    path = write_csv(
+        artifact, output_dir, row_sink=_fan_out, compression=compression
+    )
+    for writer in writers:
+        writer.close()
     return path
@@ -0,0 +1,170 @@
+"""Batch analysis of many inputs listed in a manifest."""
+from __future__ import annotations
+
+import csv
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, Sequence
+
+from .analyzers import available_analyzers, build_execution_artifact
+from .analyzers.coverage import expand_info_paths
+from .artifacts import write_artifact
+from .config import RunContext
+from .configs import ConfigFetchError
+
+
+MANIFEST_COLUMNS = (
+    "build_type",
+    "info_path",
+    "archive_dir",
+    "device_type",
+    "started_at",
+    "completed_at",
+)
+
+
+@dataclass
+class BatchEntry:
+    build_type: str
+    info_paths: tuple[pathlib.Path, ...]
+    archive_dir: pathlib.Path | None
+    device_type: str | None
+    started_at: datetime | None
+    completed_at: datetime | None
+
+
+@dataclass
+class BatchResult:
+    context: RunContext
+    uploads: list[tuple[pathlib.Path, str]]
+    artifacts: int
+    seconds: float
+    error: str | None = None
+
+
+def load_manifest(path: pathlib.Path) -> list[BatchEntry]:
+    """Read a batch manifest CSV.
+
+    Only ``build_type`` is required; see :data:`MANIFEST_COLUMNS` for the
+    optional columns. Relative paths are resolved against the manifest's
+    directory, and coverage rows must name their ``info_path``, which may be
+    a glob matching several tracefiles to merge.
+    """
+
+    analyzers = available_analyzers()
+    base_dir = path.resolve().parent
+
+    def _path(value: str) -> pathlib.Path | None:
+        return (base_dir / value).resolve() if value else None
+
+    def _timestamp(value: str) -> datetime | None:
+        return datetime.fromisoformat(value) if value else None
+
+    entries: list[BatchEntry] = []
+    with path.open(newline="", encoding="utf-8-sig") as manifest_file:
+        reader = csv.DictReader(manifest_file)
+        if not reader.fieldnames or "build_type" not in reader.fieldnames:
+            raise ValueError(f"Batch manifest {path} must contain a build_type column")
+
+        for line_number, row in enumerate(reader, start=2):
+            values = {
+                column: (row.get(column) or "").strip() for column in MANIFEST_COLUMNS
+            }
+            build_type = values["build_type"].lower()
+            if build_type not in analyzers:
+                raise ValueError(
+                    f"{path}:{line_number}: unknown build_type '{values['build_type']}'"
+                )
+            if build_type == "coverage" and not values["info_path"]:
+                raise ValueError(f"{path}:{line_number}: coverage rows need an info_path")
+
+            try:
+                started_at = _timestamp(values["started_at"])
+                completed_at = _timestamp(values["completed_at"])
+                info_paths = (
+                    expand_info_paths([values["info_path"]], base_dir)
+                    if values["info_path"]
+                    else ()
+                )
+            except (FileNotFoundError, ValueError) as exc:
+                raise ValueError(f"{path}:{line_number}: {exc}") from exc
+
+            entries.append(
+                BatchEntry(
+                    build_type=build_type,
+                    info_paths=info_paths,
+                    archive_dir=_path(values["archive_dir"]),
+                    device_type=values["device_type"].lower() or None,
+                    started_at=started_at,
+                    completed_at=completed_at,
+                )
+            )
+
+    return entries
+
+
+def preload(build_types: Iterable[str]) -> None:
+    """Load shared analyzer inputs, such as mapping tables, into this process."""
+
+    analyzers = available_analyzers()
+    for build_type in dict.fromkeys(build_types):
+        spec = analyzers[build_type]
+        if spec.preload:
+            spec.preload()
+
+
+def _analyze(
+    context: RunContext, formats: Sequence[str], compression: str | None
+) -> BatchResult:
+    """Build and write one run's artifacts; executed in a worker process."""
+
+    started = time.perf_counter()
+    spec = available_analyzers()[context.build_type]
+    uploads: list[tuple[pathlib.Path, str]] = []
+    written = 0
+    try:
+        for artifact in [build_execution_artifact(context), *spec.build(context)]:
+            path = write_artifact(
+                artifact, context.archive_dir, formats, compression=compression
+            )
+            written += 1
+            if artifact.table:
+                uploads.append((path, artifact.table))
+    except (ConfigFetchError, OSError, ValueError) as exc:
+        error = str(exc)
+    except Exception as exc:  # one bad entry must not abort the rest of the batch
+        error = f"{type(exc).__name__}: {exc}"
+    else:
+        return BatchResult(context, uploads, written, time.perf_counter() - started)
+    return BatchResult(context, [], 0, time.perf_counter() - started, error)
+
+
+def run_batch(
+    contexts: Sequence[RunContext],
+    *,
+    workers: int = 1,
+    formats: Sequence[str] = ("csv",),
+    compression: str | None = None,
+) -> Iterator[BatchResult]:
+    """Analyze every context on a process pool, yielding results as they finish.
+
+    Mapping tables are loaded once here before the pool starts, so forked
+    workers inherit them; each worker also preloads them on start-up for
+    platforms that spawn fresh interpreters.
+    """
+
+    build_types = tuple(dict.fromkeys(context.build_type for context in contexts))
+    preload(build_types)
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=preload, initargs=(build_types,)
+    ) as executor:
+        futures = [
+            executor.submit(_analyze, context, tuple(formats), compression)
+            for context in contexts
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,431 @@
+"""Benchmarks for the FITS pipeline stages on synthetic inputs.
+
+Run ``python -m fits.bench --records 10000,1000000`` to generate lcov, DTK,
+and mapping files at each scale, time every stage in a fresh process, and
+print the results as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import importlib.metadata
+import json
+import multiprocessing
+import os
+import pathlib
+import platform
+import random
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Iterator, Sequence
+
+from .analyzers import coverage, dtk
+from .artifacts import CsvArtifact, build_artifact_name, write_csv
+from .config import DatabaseConfig, RunContext, load_db_config
+from .metrics import StageMetrics, measure
+from .uploader import delete_execution, generate_exec_id, upload_execution
+
+
+DEFAULT_RECORDS = (10000, 100000)
+BENCH_DATABASE = DatabaseConfig("localhost", 3306, "bench", "", "fits_bench")
+_MODULES = ("graphics", "media", "network", "storage", "security", "kernel", "ui", "audio")
+
+
+def _directories(count: int) -> list[str]:
+    return [
+        f"src/{_MODULES[index % len(_MODULES)]}/component{index // len(_MODULES)}/sub{index % 7}"
+        for index in range(count)
+    ]
+
+
+def _file_directory(directories: Sequence[str], index: int, seed: int) -> str:
+    """Return the directory of generated source file *index*.
+
+    Shared by the tracefile and the overrides so their paths line up.
+    """
+
+    return directories[(index * 7919 + seed) % len(directories)]
+
+
+def generate_lcov(path: pathlib.Path, records: int, *, seed: int = 0) -> None:
+    """Write an lcov tracefile with *records* ``SF`` records.
+
+    Paths sit under :data:`~fits.analyzers.coverage.LCOV_PATH_PREFIX`, so the
+    parsed directories are the ones :func:`generate_mappings` maps.
+    """
+
+    rng = random.Random(seed)
+    directories = _directories(max(records // 50, 1))
+    with path.open("w", encoding="utf-8") as info:
+        info.write("TN:\n")
+        for index in range(records):
+            directory = _file_directory(directories, index, seed)
+            info.write(
+                f"SF:/workspace/{coverage.LCOV_PATH_PREFIX}{directory}/file{index}.cpp\n"
+            )
+            functions = rng.randint(0, 8)
+            for number in range(functions):
+                info.write(f"FN:{number * 10 + 1},func{number}\n")
+            for number in range(functions):
+                info.write(f"FNDA:{rng.choice((0, 1, 12))},func{number}\n")
+            info.write(f"FNF:{functions}\nFNH:{rng.randint(0, functions)}\n")
+            lines = rng.randint(5, 60)
+            for line in range(1, lines + 1):
+                info.write(f"DA:{line},{rng.choice((0, 0, 1, 7))}\n")
+            info.write(f"LF:{lines}\nLH:{rng.randint(0, lines)}\n")
+            branches = rng.randint(0, 6)
+            for branch in range(branches):
+                info.write(f"BRDA:{branch + 1},0,{branch},{rng.choice(('-', '0', '3'))}\n")
+            info.write(f"BRF:{branches}\nBRH:{rng.randint(0, branches)}\n")
+            info.write("end_of_record\n")
+
+
+def generate_dtk(directory: pathlib.Path, records: int, *, seed: int = 0) -> None:
+    """Write ``result/output.txt`` and ``standard_fully.txt`` with overlapping cases."""
+
+    rng = random.Random(seed)
+    prefixes = [f"Case{index}" for index in range(64)]
+    cases = [f"{rng.choice(prefixes)}_Clip_{index}" for index in range(records)]
+    (directory / "result").mkdir(parents=True, exist_ok=True)
+    with (directory / "result" / "output.txt").open("w", encoding="utf-8") as results:
+        for case in cases[: records * 9 // 10]:
+            suffix = ".jpg" if rng.random() < 0.2 else ""
+            value = "" if rng.random() < 0.1 else f"{rng.random():.10f}"
+            results.write(f"{case}{suffix}#{value}\n")
+    with (directory / "standard_fully.txt").open("w", encoding="utf-8") as baseline:
+        for case in cases[records // 10 :]:
+            baseline.write(f"{case}#{rng.random():.10f}\n")
+
+
+def generate_mappings(config_dir: pathlib.Path, records: int, *, seed: int = 0) -> None:
+    """Write coverage and DTK mapping CSVs matching the generated inputs."""
+
+    rng = random.Random(seed)
+    config_dir.mkdir(parents=True, exist_ok=True)
+    directories = _directories(max(records // 50, 1))
+    with (config_dir / coverage.COVERAGE_MAPPING_FILE).open("w", encoding="utf-8") as mapping:
+        mapping.write("directory,module,owner\n")
+        for module in _MODULES:
+            mapping.write(f"src/{module},{module},{module}-owner\n")
+        for directory in directories[::3]:
+            mapping.write(f"{directory},{directory.replace('/', '-')},owner{rng.randint(0, 99)}\n")
+    with (config_dir / coverage.COVERAGE_MAPPING_OVERRIDES_FILE).open(
+        "w", encoding="utf-8"
+    ) as overrides:
+        overrides.write("directory,file_name,module,owner\n")
+        for index in range(0, records, 97):
+            directory = _file_directory(directories, index, seed)
+            overrides.write(f"{directory},file{index}.cpp,override,owner\n")
+    with (config_dir / dtk.CASE_TO_MODULE_FILE).open("w", encoding="utf-8") as mapping:
+        mapping.write("casename,module\n")
+        for index in range(0, 64, 2):
+            mapping.write(f"Case{index},module{index % 8}\n")
+    with (config_dir / dtk.MODULE_TO_OWNER_FILE).open("w", encoding="utf-8") as mapping:
+        mapping.write("module,owner\n")
+        for index in range(0, 8, 2):
+            mapping.write(f"module{index},owner{index}\n")
+
+
+def generate_inputs(directory: pathlib.Path, records: int, *, seed: int = 0) -> int:
+    """Generate every benchmark input under *directory*; return their total size."""
+
+    directory.mkdir(parents=True, exist_ok=True)
+    generate_lcov(directory / "coverage.info", records, seed=seed)
+    generate_dtk(directory, records, seed=seed)
+    generate_mappings(directory / "FITS", records, seed=seed)
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+
+
+def _context(directory: pathlib.Path, jobs: int, db_config: DatabaseConfig) -> RunContext:
+    return RunContext(
+        exec_id="1",
+        device="bench",
+        build_type="coverage",
+        device_type=None,
+        info_paths=(directory / "coverage.info",),
+        archive_dir=directory / "FITS-RESULTS-bench",
+        started_at=None,
+        completed_at=None,
+        db_config=db_config,
+        jobs=jobs,
+    )
+
+
+def _coverage_artifact(context: RunContext, rows) -> CsvArtifact:
+    return CsvArtifact(
+        name=build_artifact_name(
+            context.db_config.database, coverage.COVERAGE_RESULTS_TABLE
+        ),
+        headers=coverage.COVERAGE_RESULTS_HEADERS,
+        rows=rows,
+        table=coverage.COVERAGE_RESULTS_TABLE,
+    )
+
+
+def _bench_lcov_parse(context: RunContext) -> StageMetrics:
+    with measure("lcov_parse") as metrics:
+        metrics.rows = sum(1 for _ in coverage._parse_lcov(context.info_paths[0]))
+    return metrics
+
+
+def _bench_lcov_parse_reference(context: RunContext) -> StageMetrics:
+    with measure("lcov_parse_reference") as metrics:
+        metrics.rows = sum(
+            1 for _ in coverage._parse_lcov(context.info_paths[0], "reference")
+        )
+    return metrics
+
+
+def _bench_lcov_parse_parallel(context: RunContext) -> StageMetrics:
+    with measure("lcov_parse_parallel") as metrics:
+        metrics.rows = sum(
+            1 for _ in coverage._parse_lcov_parallel(context.info_paths[0], context.jobs)
+        )
+    return metrics
+
+
+def _bench_lcov_merge(context: RunContext) -> StageMetrics:
+    # Merges two copies of the tracefile, as if two test shards covered the
+    # same sources.
+    records = coverage._merge_lcov(
+        context.info_paths * 2, context.jobs, coverage._detail_record
+    )
+    with measure("lcov_merge") as metrics:
+        metrics.rows = sum(1 for _ in records)
+    return metrics
+
+
+def _coverage_rows(context: RunContext) -> Iterator[dict]:
+    # Serial parsing keeps enrichment comparable to lcov_parse; the parallel
+    # parser has its own stage.
+    serial = dataclasses.replace(context, jobs=1)
+    config_dir = context.archive_dir.parent / "FITS"
+    return coverage._enriched_rows(serial, context.info_paths, config_dir)
+
+
+def _bench_coverage_enrich(context: RunContext) -> StageMetrics:
+    rows = resolved = 0
+    with measure("coverage_enrich") as metrics:
+        for row in _coverage_rows(context):
+            rows += 1
+            resolved += row["module"] is not None
+        metrics.rows = rows
+    # Otherwise the stage would only be timing mapping misses.
+    if rows and not resolved:
+        raise RuntimeError("coverage_enrich resolved no modules from the generated mappings")
+    return metrics
+
+
+def _bench_dtk_join(context: RunContext, stream: bool = False) -> StageMetrics:
+    case_to_module, module_to_owner = dtk._mappings(context.archive_dir.parent / "FITS")
+    read_rows = dtk._stream_results if stream else dtk._read_results
+    with measure("dtk_stream_join" if stream else "dtk_join") as metrics:
+        metrics.rows = sum(1 for _ in read_rows(context, case_to_module, module_to_owner))
+    return metrics
+
+
+def _bench_dtk_stream_join(context: RunContext) -> StageMetrics:
+    return _bench_dtk_join(context, stream=True)
+
+
+def _bench_write_csv(context: RunContext) -> StageMetrics:
+    rows = list(_coverage_rows(context))
+    with measure("write_csv") as metrics:
+        write_csv(_coverage_artifact(context, rows), context.archive_dir)
+        metrics.rows = len(rows)
+    return metrics
+
+
+def _bench_upload(context: RunContext) -> StageMetrics:
+    context.exec_id = generate_exec_id("coverage", test=True)
+    rows = list(_coverage_rows(context))
+    path = write_csv(_coverage_artifact(context, rows), context.archive_dir)
+    table = coverage.COVERAGE_RESULTS_TABLE
+    try:
+        with measure("upload") as metrics:
+            uploads = upload_execution(
+                [(path, table)],
+                context.db_config,
+                context.exec_id,
+                context.build_type,
+                context.archive_dir,
+            )
+            metrics.rows = sum(upload.rows for upload in uploads)
+    finally:
+        delete_execution(context.db_config, context.exec_id, [table])
+    return metrics
+
+
+STAGES: dict[str, Callable[[RunContext], StageMetrics]] = {
+    "lcov_parse": _bench_lcov_parse,
+    "lcov_parse_reference": _bench_lcov_parse_reference,
+    "lcov_parse_parallel": _bench_lcov_parse_parallel,
+    "lcov_merge": _bench_lcov_merge,
+    "coverage_enrich": _bench_coverage_enrich,
+    "dtk_join": _bench_dtk_join,
+    "dtk_stream_join": _bench_dtk_stream_join,
+    "write_csv": _bench_write_csv,
+    "upload": _bench_upload,
+}
+# Stages that need a configured MySQL database and only run with --upload.
+DATABASE_STAGES = ("upload",)
+
+
+def _run_stage(name: str, context: RunContext) -> dict[str, object]:
+    return STAGES[name](context).as_dict()
+
+
+def run_stage(name: str, context: RunContext) -> dict[str, object]:
+    """Run one stage in a freshly spawned process so peak RSS is its own."""
+
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return executor.submit(_run_stage, name, context).result()
+
+
+def _records(value: str) -> tuple[int, ...]:
+    try:
+        counts = tuple(int(part) for part in value.split(",") if part.strip())
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid record counts: {value}") from exc
+    if not counts or min(counts) < 1:
+        raise argparse.ArgumentTypeError("record counts must be positive integers")
+    return counts
+
+
+def _repeat(value: str) -> int:
+    try:
+        count = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid repeat count: {value}") from exc
+    if count < 1:
+        raise argparse.ArgumentTypeError("repeat count must be a positive integer")
+    return count
+
+
+def _stages(value: str) -> tuple[str, ...]:
+    names = tuple(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown stage(s): {', '.join(unknown)}")
+    return names
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="fits.bench", description="Benchmark FITS pipeline stages on synthetic inputs"
+    )
+    parser.add_argument(
+        "--records",
+        type=_records,
+        default=DEFAULT_RECORDS,
+        help="Comma-separated input sizes to benchmark, e.g. 10000,1000000 "
+        f"(default: {','.join(map(str, DEFAULT_RECORDS))})",
+    )
+    parser.add_argument(
+        "--stages",
+        type=_stages,
+        help=f"Comma-separated stages to run (default: all except {', '.join(DATABASE_STAGES)}); "
+        f"available: {', '.join(STAGES)}",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for lcov_parse_parallel and lcov_merge (default: CPU count)",
+    )
+    parser.add_argument(
+        "--repeat", type=_repeat, default=1, help="Run every stage this many times (default: 1)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the input generators")
+    parser.add_argument(
+        "--work-dir",
+        dest="work_dir",
+        type=pathlib.Path,
+        help="Directory for generated inputs (default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the generated inputs after the run"
+    )
+    parser.add_argument(
+        "--upload",
+        action="store_true",
+        help="Also benchmark uploads against the configured MySQL database; rows are "
+        "inserted under a 9999-prefixed test exec_id and deleted afterwards",
+    )
+    parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        help="Write the JSON report to this file instead of stdout",
+    )
+    return parser.parse_args(argv)
+
+
+def _version() -> str | None:
+    try:
+        return importlib.metadata.version("fits-cli")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    stages = args.stages or tuple(name for name in STAGES if name not in DATABASE_STAGES)
+    if args.upload and "upload" not in stages:
+        stages = (*stages, "upload")
+    if "upload" in stages and not args.upload:
+        print("Bench failed: the upload stage requires --upload")
+        return 1
+
+    try:
+        db_config = load_db_config() if args.upload else BENCH_DATABASE
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"Bench failed: {exc}")
+        return 1
+
+    report: dict[str, object] = {
+        "fits_version": _version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "results": [],
+    }
+
+    work_dir = (
+        args.work_dir.resolve()
+        if args.work_dir
+        else pathlib.Path(tempfile.mkdtemp(prefix="fits-bench-"))
+    )
+    try:
+        for records in args.records:
+            directory = work_dir / f"records-{records}"
+            input_bytes = generate_inputs(directory, records, seed=args.seed)
+            context = _context(directory, args.jobs, db_config)
+            for name in stages:
+                for run in range(args.repeat):
+                    result = run_stage(name, context)
+                    report["results"].append(
+                        {"records": records, "input_bytes": input_bytes, "run": run, **result}
+                    )
+            if not args.keep:
+                shutil.rmtree(directory)
+    finally:
+        if args.keep:
+            report["work_dir"] = str(work_dir)
+        elif not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,215 @@
+"""On-disk cache of parsed analyzer rows keyed by input file contents."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import pathlib
+import pickle
+from typing import Callable, Iterable, Iterator, Mapping, Sequence
+
+from .config import RunContext
+from .metrics import timed
+
+
+CACHE_DIR_ENV_VAR = "FITS_CACHE_DIR"
+DEFAULT_CACHE_DIR = pathlib.Path.home() / ".cache" / "fits" / "parsed"
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Bump when parsing or enrichment logic changes so stale entries are ignored.
+CACHE_FORMAT_VERSION = 1
+ENTRY_SUFFIX = ".rows.gz"
+_CHUNK_ROWS = 10000
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def default_cache_dir() -> pathlib.Path:
+    """Return the cache directory from FITS_CACHE_DIR or the user cache."""
+
+    env_override = os.environ.get(CACHE_DIR_ENV_VAR)
+    return pathlib.Path(env_override) if env_override else DEFAULT_CACHE_DIR
+
+
+def file_stamp(path: pathlib.Path) -> tuple[int, int] | None:
+    """Return a cheap ``(size, mtime_ns)`` change marker, or None if missing."""
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def fingerprint(path: pathlib.Path) -> str:
+    """Describe a file by size, mtime, and content hash (or mark it missing)."""
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return "missing"
+
+    digest = hashlib.blake2b(digest_size=20)
+    with path.open("rb") as handle:
+        while block := handle.read(_HASH_BLOCK_SIZE):
+            digest.update(block)
+    return f"{stat.st_size}:{stat.st_mtime_ns}:{digest.hexdigest()}"
+
+
+class _EntryWriter:
+    """Stream rows into a pending cache entry, publishing it on success."""
+
+    def __init__(self, cache: "ParseCache", key: str) -> None:
+        self._cache = cache
+        self._path = cache.entry_path(key)
+        self._pending = self._path.with_name(self._path.name + f".{os.getpid()}.tmp")
+        self._chunk: list[tuple] = []
+        self._handle = None
+
+    def __enter__(self) -> "_EntryWriter":
+        self._cache.directory.mkdir(parents=True, exist_ok=True)
+        self._handle = gzip.open(self._pending, "wb", compresslevel=1)
+        return self
+
+    def append(self, values: tuple) -> None:
+        self._chunk.append(values)
+        if len(self._chunk) >= _CHUNK_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._chunk:
+            pickle.dump(self._chunk, self._handle, protocol=pickle.HIGHEST_PROTOCOL)
+            self._chunk = []
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        try:
+            if exc_type is None:
+                self._flush()
+            self._handle.close()
+            if exc_type is None:
+                self._pending.replace(self._path)
+                self._cache.evict()
+        finally:
+            self._pending.unlink(missing_ok=True)
+
+
+class ParseCache:
+    """Directory of gzip-compressed, pickled row chunks with LRU eviction.
+
+    Entries are touched on every hit, and the least recently used ones are
+    removed once the directory grows beyond ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(
+        self, namespace: str, inputs: Sequence[pathlib.Path], *extra: object
+    ) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((CACHE_FORMAT_VERSION, namespace, extra)).encode())
+        for path in inputs:
+            digest.update(fingerprint(path).encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def child_key(
+        self, parent: str, namespace: str, inputs: Sequence[pathlib.Path]
+    ) -> str:
+        """Return a key under *parent* that :meth:`has_children` can find."""
+
+        return f"{parent}-{self.key(namespace, inputs)}"
+
+    def has_children(self, parent: str) -> bool:
+        """Return whether any entry is stored under a child key of *parent*."""
+
+        return any(self.directory.glob(f"{parent}-*{ENTRY_SUFFIX}"))
+
+    def entry_path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def load(self, key: str) -> Iterator[tuple] | None:
+        """Return an iterator over cached row values, or None on a miss."""
+
+        path = self.entry_path(key)
+        if not path.exists():
+            return None
+        os.utime(path)
+        return self._read(path)
+
+    @staticmethod
+    def _read(path: pathlib.Path) -> Iterator[tuple]:
+        with gzip.open(path, "rb") as handle:
+            while True:
+                try:
+                    chunk = pickle.load(handle)
+                except EOFError:
+                    return
+                yield from chunk
+
+    def writer(self, key: str) -> _EntryWriter:
+        return _EntryWriter(self, key)
+
+    def evict(self) -> None:
+        """Delete least recently used entries until under ``max_bytes``."""
+
+        entries = []
+        for path in self.directory.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def context_cache(context: RunContext) -> ParseCache | None:
+    """Return the parse cache configured for a run, or None if disabled."""
+
+    if context.cache_dir is None:
+        return None
+    return ParseCache(context.cache_dir, context.cache_max_bytes)
+
+
+def cached_rows(
+    cache: ParseCache | None,
+    key: Callable[[], str],
+    headers: Sequence[str],
+    exec_id: str,
+    produce: Callable[[], Iterable[Mapping[str, object]]],
+) -> Iterator[Mapping[str, object]]:
+    """Yield analyzer rows, replaying them from *cache* when inputs are unchanged.
+
+    Rows are stored without their ``exec_id`` column; on a hit the current
+    *exec_id* is filled back in and *produce* is never called. On a miss the
+    produced rows are passed through and recorded as they go; the entry is
+    only published if every row was consumed.
+    """
+
+    if cache is None:
+        yield from produce()
+        return
+
+    columns = [header for header in headers if header != "exec_id"]
+    entry_key = key()
+    cached = cache.load(entry_key)
+    if cached is not None:
+        for values in timed("cache_replay", cached):
+            row = dict(zip(columns, values))
+            row["exec_id"] = exec_id
+            yield row
+        return
+
+    with cache.writer(entry_key) as writer:
+        for row in produce():
+            writer.append(tuple(row.get(column) for column in columns))
+            yield row
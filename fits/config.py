@@ -28,11 +28,18 @@ class RunContext:
     device: str
     build_type: str
     device_type: str | None
-    info_path: pathlib.Path | None
+    # One path, or several lcov tracefiles to merge; empty to auto-detect.
+    info_paths: tuple[pathlib.Path, ...]
     archive_dir: pathlib.Path
     started_at: datetime | None
     completed_at: datetime | None
     db_config: DatabaseConfig
+    jobs: int = 1
+    stream_join: bool = False
+    coverage_snapshot: pathlib.Path | None = None
+    coverage_detail: bool = False
+    cache_dir: pathlib.Path | None = None
+    cache_max_bytes: int = 0
 
 
 def detect_device() -> str:
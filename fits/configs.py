@@ -0,0 +1,170 @@
+"""Fetching the FITS config checkout and tracking how fresh it is."""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import shlex
+import subprocess
+import time
+from dataclasses import dataclass
+
+
+CONFIG_DIR_NAME = "FITS"
+CLONE_COMMAND = "git-clone-configs"
+# Replaces the clone command, e.g. with a local stub for testing.
+CLONE_COMMAND_ENV_VAR = "FITS_CLONE_CONFIGS_CMD"
+CONFIG_TTL_ENV_VAR = "FITS_CONFIG_TTL"
+STAMP_FILE = ".fits-configs.json"
+
+
+class ConfigFetchError(RuntimeError):
+    """Raised when the config clone command cannot be run or fails."""
+
+
+@dataclass
+class ConfigStamp:
+    revision: str | None
+    fetched_at: float
+
+
+def checkout_dir() -> pathlib.Path:
+    return pathlib.Path.cwd() / CONFIG_DIR_NAME
+
+
+def default_config_ttl() -> int:
+    """Return the freshness TTL in seconds from FITS_CONFIG_TTL (default 0)."""
+
+    value = os.environ.get(CONFIG_TTL_ENV_VAR)
+    if not value:
+        return 0
+    try:
+        return max(int(value), 0)
+    except ValueError as exc:
+        raise ValueError(f"{CONFIG_TTL_ENV_VAR} must be a number of seconds") from exc
+
+
+def _clone_command() -> list[str]:
+    return shlex.split(os.environ.get(CLONE_COMMAND_ENV_VAR) or CLONE_COMMAND)
+
+
+def _stamp_path() -> pathlib.Path:
+    return pathlib.Path.cwd() / STAMP_FILE
+
+
+def checkout_revision(directory: pathlib.Path) -> str | None:
+    """Return the git revision of *directory*, or None if it is not a checkout."""
+
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(directory), "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def read_stamp() -> ConfigStamp | None:
+    try:
+        data = json.loads(_stamp_path().read_text(encoding="utf-8"))
+        return ConfigStamp(data.get("revision"), float(data["fetched_at"]))
+    except (FileNotFoundError, KeyError, TypeError, ValueError):
+        return None
+
+
+def write_stamp() -> ConfigStamp:
+    """Record the current checkout revision and the time it was fetched."""
+
+    stamp = ConfigStamp(checkout_revision(checkout_dir()), time.time())
+    pending = _stamp_path().with_name(STAMP_FILE + ".tmp")
+    pending.write_text(
+        json.dumps({"revision": stamp.revision, "fetched_at": stamp.fetched_at}),
+        encoding="utf-8",
+    )
+    pending.replace(_stamp_path())
+    return stamp
+
+
+def fresh_stamp(ttl: int) -> ConfigStamp | None:
+    """Return the stamp if the checkout was fetched within *ttl* seconds.
+
+    The checkout also has to still be at the recorded revision, so a
+    checkout changed by hand is fetched again.
+    """
+
+    if ttl <= 0 or not checkout_dir().is_dir():
+        return None
+    stamp = read_stamp()
+    if stamp is None or time.time() - stamp.fetched_at >= ttl:
+        return None
+    if stamp.revision != checkout_revision(checkout_dir()):
+        return None
+    return stamp
+
+
+def _describe_failure(returncode: int) -> str:
+    return f"{CLONE_COMMAND} exited with status {returncode}"
+
+
+def clone_configs() -> None:
+    """Run the clone command in the foreground and stamp the checkout."""
+
+    try:
+        subprocess.run(_clone_command(), check=True)
+    except FileNotFoundError as exc:
+        raise ConfigFetchError(f"{CLONE_COMMAND} command not found") from exc
+    except subprocess.CalledProcessError as exc:
+        raise ConfigFetchError(_describe_failure(exc.returncode)) from exc
+    write_stamp()
+
+
+class _BackgroundClone:
+    def __init__(self, process: subprocess.Popen) -> None:
+        self.process = process
+        self.error: ConfigFetchError | None = None
+        self.done = False
+
+    def wait(self) -> None:
+        if not self.done:
+            self.done = True
+            returncode = self.process.wait()
+            if returncode:
+                self.error = ConfigFetchError(_describe_failure(returncode))
+            else:
+                write_stamp()
+        if self.error is not None:
+            raise self.error
+
+
+_pending: _BackgroundClone | None = None
+
+
+def start_clone() -> None:
+    """Start the clone command without waiting; see :func:`wait_for_configs`."""
+
+    global _pending
+    try:
+        process = subprocess.Popen(_clone_command())
+    except FileNotFoundError as exc:
+        raise ConfigFetchError(f"{CLONE_COMMAND} command not found") from exc
+    _pending = _BackgroundClone(process)
+
+
+def configs_pending() -> bool:
+    """Return True while a background clone has not been waited for."""
+
+    return _pending is not None and not _pending.done
+
+
+def wait_for_configs() -> None:
+    """Block until a background clone finishes; a no-op if none was started.
+
+    Analyzers call this before reading mapping files. A failed clone raises
+    :class:`ConfigFetchError` on every call.
+    """
+
+    if _pending is not None:
+        _pending.wait()
@@ -0,0 +1,233 @@
+"""Wall time, CPU time, throughput, and memory measurements for pipeline stages."""
+from __future__ import annotations
+
+import contextlib
+import sys
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Sequence, TypeVar
+
+from .artifacts import CsvArtifact, build_artifact_name
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+T = TypeVar("T")
+
+RUN_METRICS_TABLE = "run_metrics"
+RUN_METRICS_HEADERS = [
+    "exec_id",
+    "stage",
+    "wall_seconds",
+    "cpu_seconds",
+    "rows",
+    "rows_per_second",
+    "peak_rss_bytes",
+]
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows: int | None = None
+    peak_rss_bytes: int = 0
+
+    @property
+    def rows_per_second(self) -> float | None:
+        if self.rows is None or self.wall_seconds <= 0:
+            return None
+        return self.rows / self.wall_seconds
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "stage": self.name,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "rows": self.rows,
+            "rows_per_second": None
+            if self.rows_per_second is None
+            else round(self.rows_per_second, 1),
+            "peak_rss_bytes": self.peak_rss_bytes,
+        }
+
+
+def peak_rss_bytes() -> int:
+    """Return this process's peak resident set size so far, or 0 if unknown."""
+
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextlib.contextmanager
+def measure(name: str) -> Iterator[StageMetrics]:
+    """Time the enclosed block; callers may set ``rows`` on the yielded record.
+
+    ``peak_rss_bytes`` is the process high-water mark when the block ends, so
+    it only isolates a stage when the stage runs in its own process.
+    """
+
+    metrics = StageMetrics(name)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield metrics
+    finally:
+        metrics.wall_seconds = time.perf_counter() - wall_start
+        metrics.cpu_seconds = time.process_time() - cpu_start
+        metrics.peak_rss_bytes = peak_rss_bytes()
+
+
+def build_metrics_artifact(
+    database: str, exec_id: str, stages: Sequence[StageMetrics]
+) -> CsvArtifact:
+    """Return the ``run_metrics`` artifact with one row per stage."""
+
+    return CsvArtifact(
+        name=build_artifact_name(database, RUN_METRICS_TABLE),
+        headers=RUN_METRICS_HEADERS,
+        rows=[{"exec_id": exec_id, **metrics.as_dict()} for metrics in stages],
+        table=RUN_METRICS_TABLE,
+        column_types={
+            "exec_id": "int64",
+            "wall_seconds": "float64",
+            "cpu_seconds": "float64",
+            "rows": "int64",
+            "rows_per_second": "float64",
+            "peak_rss_bytes": "int64",
+        },
+    )
+
+
+class StageRecorder:
+    """Collect exclusive wall and CPU time per named stage for one run.
+
+    Stages nest: while a stage is active, time spent in a stage entered from
+    it (for example a parser iterated by the CSV writer) is charged to the
+    inner stage only, so the per-stage times add up to the run's total.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageMetrics] = {}
+        self._stack: list[StageMetrics] = []
+        self._started_wall = self._wall = time.perf_counter()
+        self._started_cpu = self._cpu = time.process_time()
+
+    def _metrics(self, name: str) -> StageMetrics:
+        metrics = self.stages.get(name)
+        if metrics is None:
+            metrics = self.stages[name] = StageMetrics(name)
+        return metrics
+
+    def _charge(self) -> None:
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if self._stack:
+            current = self._stack[-1]
+            current.wall_seconds += wall - self._wall
+            current.cpu_seconds += cpu - self._cpu
+        self._wall = wall
+        self._cpu = cpu
+
+    def _enter(self, metrics: StageMetrics) -> None:
+        self._charge()
+        self._stack.append(metrics)
+
+    def _exit(self) -> None:
+        self._charge()
+        self._stack.pop()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        metrics = self._metrics(name)
+        self._enter(metrics)
+        try:
+            yield metrics
+        finally:
+            self._exit()
+            metrics.peak_rss_bytes = peak_rss_bytes()
+
+    def iterate(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Yield from *iterable*, charging the time spent producing items to *name*."""
+
+        metrics = self._metrics(name)
+        metrics.rows = metrics.rows or 0
+        iterator = iter(iterable)
+        while True:
+            self._enter(metrics)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self._exit()
+                metrics.peak_rss_bytes = peak_rss_bytes()
+                return
+            except BaseException:
+                self._exit()
+                raise
+            self._exit()
+            metrics.rows += 1
+            yield item
+
+    def count(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Yield from *iterable*, adding each item to the row count of *name*."""
+
+        metrics = self._metrics(name)
+        metrics.rows = metrics.rows or 0
+        for item in iterable:
+            metrics.rows += 1
+            yield item
+
+    def total(self) -> StageMetrics:
+        return StageMetrics(
+            "total",
+            wall_seconds=time.perf_counter() - self._started_wall,
+            cpu_seconds=time.process_time() - self._started_cpu,
+            peak_rss_bytes=peak_rss_bytes(),
+        )
+
+    def results(self) -> list[StageMetrics]:
+        return [*self.stages.values(), self.total()]
+
+
+_recorder: StageRecorder | None = None
+
+
+def start_recording() -> StageRecorder:
+    """Install a recorder that :func:`stage` and :func:`timed` report into."""
+
+    global _recorder
+    _recorder = StageRecorder()
+    return _recorder
+
+
+def recorder() -> StageRecorder | None:
+    return _recorder
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[StageMetrics | None]:
+    """Record the enclosed block as *name*; does nothing unless recording."""
+
+    if _recorder is None:
+        yield None
+        return
+    with _recorder.stage(name) as metrics:
+        yield metrics
+
+
+def timed(name: str, iterable: Iterable[T]) -> Iterable[T]:
+    """Charge the production of *iterable*'s items to *name* when recording.
+
+    Returns *iterable* unchanged when no recorder is installed.
+    """
+
+    if _recorder is None:
+        return iterable
+    return _recorder.iterate(name, iterable)
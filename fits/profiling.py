@@ -0,0 +1,135 @@
+"""cProfile statistics and sampled flamegraph stacks for slow runs."""
+from __future__ import annotations
+
+import cProfile
+import collections
+import contextlib
+import pathlib
+import sys
+import threading
+from types import FrameType
+from typing import Iterator
+
+
+DEFAULT_PROFILE_NAME = "fits.profile"
+STATS_SUFFIX = ".pstats"
+COLLAPSED_SUFFIX = ".collapsed.txt"
+SAMPLE_INTERVAL = 0.005
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame: FrameType | None, root: str) -> str:
+    """Return *frame*'s call stack as ``root;outer;...;inner``."""
+
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(root)
+    return ";".join(reversed(labels))
+
+
+class StackSampler(threading.Thread):
+    """Count the call stacks of every other thread at a fixed wall-clock interval.
+
+    Sampling only happens while :attr:`active` is set, so the thread sleeps
+    between profiled sections.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        super().__init__(name="fits-profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks: collections.Counter[str] = collections.Counter()
+        self.active = threading.Event()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            self.active.wait()
+            if self._stopped.is_set():
+                return
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self.stacks[collapse_stack(frame, names.get(ident, str(ident)))] += 1
+            self._stopped.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.active.set()
+        self.join()
+
+
+class Profiler:
+    """cProfile plus a stack sampler, enabled only inside :meth:`section` blocks."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(interval)
+        self.sampler.start()
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def section(self) -> Iterator[None]:
+        self._depth += 1
+        if self._depth == 1:
+            self.sampler.active.set()
+            self.profile.enable()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.profile.disable()
+                self.sampler.active.clear()
+
+    def write(
+        self, directory: pathlib.Path, name: str = DEFAULT_PROFILE_NAME
+    ) -> tuple[pathlib.Path, pathlib.Path]:
+        """Write ``<name>.pstats`` and ``<name>.collapsed.txt`` into *directory*.
+
+        The collapsed file has one ``frame;frame;... count`` line per sampled
+        stack, the input format of ``flamegraph.pl`` and speedscope.
+        """
+
+        self.sampler.stop()
+        directory.mkdir(parents=True, exist_ok=True)
+        stats_path = directory / f"{name}{STATS_SUFFIX}"
+        collapsed_path = directory / f"{name}{COLLAPSED_SUFFIX}"
+        self.profile.dump_stats(str(stats_path))
+        with collapsed_path.open("w", encoding="utf-8") as collapsed_file:
+            for stack, count in sorted(self.sampler.stacks.items()):
+                collapsed_file.write(f"{stack} {count}\n")
+        return stats_path, collapsed_path
+
+
+_profiler: Profiler | None = None
+
+
+def start_profiling(interval: float = SAMPLE_INTERVAL) -> Profiler:
+    """Install the profiler that :func:`profiled` sections report into."""
+
+    global _profiler
+    _profiler = Profiler(interval)
+    return _profiler
+
+
+def profiler() -> Profiler | None:
+    return _profiler
+
+
+@contextlib.contextmanager
+def profiled() -> Iterator[None]:
+    """Profile the enclosed block; does nothing unless profiling was started."""
+
+    if _profiler is None:
+        yield
+        return
+    with _profiler.section():
+        yield
@@ -2,15 +2,188 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import dataclasses
+import functools
+import json
 import pathlib
-import subprocess
+import time
 from datetime import datetime
 from typing import Sequence
 
-from .analyzers import available_analyzers
-from .artifacts import CsvArtifact, build_artifact_name, write_csv
+from .analyzers import available_analyzers, build_execution_artifact
+from .analyzers.coverage import expand_info_paths
+from .artifacts import (
+    ARTIFACT_FORMATS,
+    COMPRESSION_SUFFIXES,
+    CsvArtifact,
+    write_artifact,
+)
+from .batch import load_manifest, run_batch
+from .cache import (
+    CACHE_DIR_ENV_VAR,
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CACHE_MAX_BYTES,
+    default_cache_dir,
+)
 from .config import RunContext, detect_device, load_db_config
-from .uploader import UploadError, generate_exec_id, upload_coverage, upload_dtk
+from .configs import (
+    CONFIG_TTL_ENV_VAR,
+    ConfigFetchError,
+    clone_configs,
+    default_config_ttl,
+    fresh_stamp,
+    start_clone,
+    wait_for_configs,
+)
+from .metrics import (
+    RUN_METRICS_TABLE,
+    StageMetrics,
+    StageRecorder,
+    build_metrics_artifact,
+    recorder,
+    stage,
+    start_recording,
+)
+from .profiling import DEFAULT_PROFILE_NAME, profiled, profiler, start_profiling
+from .uploader import (
+    DEFAULT_BATCH_SIZE,
+    UPLOAD_ENGINES,
+    UploadError,
+    UploadOptions,
+    find_archives,
+    generate_exec_id,
+    open_pool,
+    upload_archives,
+    upload_csv,
+    upload_direct,
+    upload_execution,
+)
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+
+def _artifact_formats(value: str) -> tuple[str, ...]:
+    parts = (part.strip().lower() for part in value.split(","))
+    formats = tuple(dict.fromkeys(part for part in parts if part))
+    unknown = [name for name in formats if name not in ARTIFACT_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown artifact format(s): {', '.join(unknown)}")
+    if "csv" not in formats:
+        raise argparse.ArgumentTypeError("csv must be included; it is always written")
+    return formats
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--artifact-format",
+        dest="artifact_formats",
+        type=_artifact_formats,
+        default=("csv",),
+        help="Comma-separated artifact formats to write, e.g. csv,parquet (default: csv)",
+    )
+    parser.add_argument(
+        "--artifact-compression",
+        dest="artifact_compression",
+        choices=COMPRESSION_SUFFIXES.keys(),
+        help="Stream CSV artifacts through gzip (.csv.gz) or zstd (.csv.zst)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=pathlib.Path,
+        help=f"Directory for cached parse results (default: ${CACHE_DIR_ENV_VAR} or {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        dest="cache_max_mb",
+        type=_positive_int,
+        default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+        help="Evict least recently used cache entries beyond this size in MiB",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="Always re-parse inputs instead of using the parse cache",
+    )
+    parser.add_argument(
+        "--jobs",
+        dest="jobs",
+        type=_positive_int,
+        default=1,
+        help="Number of worker processes used to parse coverage input (default: 1)",
+    )
+    parser.add_argument(
+        "--stream-join",
+        dest="stream_join",
+        action="store_true",
+        help="Join DTK results against a memory-mapped baseline to bound memory use",
+    )
+
+
+def _add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Skip git-clone-configs and use the existing FITS config checkout",
+    )
+    parser.add_argument(
+        "--config-ttl",
+        dest="config_ttl",
+        type=int,
+        help="Skip git-clone-configs if the checkout was fetched within this many seconds "
+        f"(default: ${CONFIG_TTL_ENV_VAR} or 0)",
+    )
+
+
+def _add_upload_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--upload-engine",
+        dest="upload_engine",
+        choices=UPLOAD_ENGINES,
+        default="auto",
+        help="How CSV artifacts are sent to MySQL: LOAD DATA LOCAL INFILE, "
+        "executemany INSERTs, or auto (LOAD DATA with INSERT fallback)",
+    )
+    parser.add_argument(
+        "--upload-batch-size",
+        dest="upload_batch_size",
+        type=_positive_int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per multi-row INSERT when uploading (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--upload-commit",
+        dest="upload_commit",
+        choices=("once", "batch"),
+        default="once",
+        help="Commit once per table (default) or after every upload batch",
+    )
+    parser.add_argument(
+        "--upload-workers",
+        dest="upload_workers",
+        type=_positive_int,
+        default=1,
+        help="Upload artifact tables concurrently with this many connections (default: 1)",
+    )
+    upload_group = parser.add_mutually_exclusive_group()
+    upload_group.add_argument(
+        "--upload",
+        action="store_true",
+        help="Upload generated CSV artifacts to the configured MySQL database",
+    )
+    upload_group.add_argument(
+        "--upload-test",
+        dest="upload_test",
+        action="store_true",
+        help="Test upload with an exec_id prefixed by 9999",
+    )
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -57,97 +230,208 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     )
     analyze.add_argument(
         "--info-path",
-        dest="info_path",
+        dest="info_paths",
+        nargs="+",
+        action="extend",
+        metavar="PATH",
+        help=(
+            "Optional lcov .info file for coverage analysis; repeat it or pass a glob "
+            "(e.g. 'shards/*.info') to merge several tracefiles"
+        ),
+    )
+    analyze.add_argument(
+        "--coverage-snapshot",
+        dest="coverage_snapshot",
         type=pathlib.Path,
-        help="Optional lcov .info file for coverage analysis",
+        help="Upload only coverage changes versus this local snapshot of the last full run",
     )
-    upload_group = analyze.add_mutually_exclusive_group()
-    upload_group.add_argument(
-        "--upload",
+    analyze.add_argument(
+        "--coverage-detail",
+        dest="coverage_detail",
         action="store_true",
-        help="Upload generated CSV artifacts to the configured MySQL database",
+        help="Also write per-line (coverage_lines) and per-function (coverage_functions) artifacts",
     )
-    upload_group.add_argument(
-        "--upload-test",
-        dest="upload_test",
+    _add_config_arguments(analyze)
+    analyze.add_argument(
+        "--clone-in-background",
+        dest="clone_in_background",
         action="store_true",
-        help="Test upload with an exec_id prefixed by 9999",
+        help="Fetch configs while parsing starts and wait for them before enrichment",
+    )
+    _add_output_arguments(analyze)
+    _add_upload_arguments(analyze)
+    analyze.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time, CPU time, rows/sec and peak RSS for each pipeline stage",
+    )
+    analyze.add_argument(
+        "--metrics-out",
+        dest="metrics_out",
+        type=pathlib.Path,
+        help="Write per-stage metrics as JSON to this file",
+    )
+    analyze.add_argument(
+        "--metrics-artifact",
+        dest="metrics_artifact",
+        action="store_true",
+        help=f"Write per-stage metrics as a {RUN_METRICS_TABLE} artifact, uploaded with --upload",
+    )
+    analyze.add_argument(
+        "--profile-out",
+        dest="profile_out",
+        nargs="?",
+        const=DEFAULT_PROFILE_NAME,
+        metavar="NAME",
+        help=(
+            "Profile building, writing and uploading; write NAME.pstats and "
+            f"NAME.collapsed.txt to the archive directory (default name: {DEFAULT_PROFILE_NAME})"
+        ),
+    )
+    analyze.add_argument(
+        "--upload-direct",
+        dest="upload_direct",
+        action="store_true",
+        help="Insert rows into MySQL while writing the CSVs instead of re-reading them",
     )
 
-    return parser.parse_args(argv)
+    batch = subparsers.add_parser(
+        "batch", help="Run the analyses listed in a manifest in one process pool"
+    )
+    batch.add_argument(
+        "--manifest",
+        type=pathlib.Path,
+        required=True,
+        help="CSV listing build_type, info_path, archive_dir, device_type, started_at, completed_at",
+    )
+    batch.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="Number of manifest entries analyzed concurrently (default: 1)",
+    )
+    _add_config_arguments(batch)
+    _add_output_arguments(batch)
+    _add_upload_arguments(batch)
+
+    upload = subparsers.add_parser(
+        "upload",
+        help="Upload existing archive directories, resuming interrupted uploads",
+    )
+    upload.add_argument(
+        "--archive-dir",
+        "--archive-path",
+        dest="archive_dirs",
+        type=pathlib.Path,
+        nargs="+",
+        action="extend",
+        required=True,
+        help="FITS-RESULTS-* directories to upload, or directories containing them",
+    )
+    upload.add_argument(
+        "--upload-batch-size",
+        dest="upload_batch_size",
+        type=_positive_int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per committed INSERT batch (default: {DEFAULT_BATCH_SIZE})",
+    )
+    upload.add_argument(
+        "--upload-workers",
+        dest="upload_workers",
+        type=_positive_int,
+        default=1,
+        help="Upload this many archives concurrently over shared connections (default: 1)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "analyze" and args.upload_direct and not (
+        args.upload or args.upload_test
+    ):
+        analyze.error("--upload-direct requires --upload or --upload-test")
+    return args
 
 
 def build_context(args: argparse.Namespace) -> RunContext:
     db_config = load_db_config()
     exec_id = generate_exec_id(args.build_type, test=args.upload_test)
     archive_dir = args.archive_dir or pathlib.Path(f"FITS-RESULTS-{exec_id}")
-    info_path = args.info_path.resolve() if args.info_path else None
+    info_paths = expand_info_paths(args.info_paths) if args.info_paths else ()
     return RunContext(
         exec_id=exec_id,
         device=detect_device(),
         build_type=args.build_type,
         device_type=args.device_type,
-        info_path=info_path,
+        info_paths=info_paths,
         archive_dir=archive_dir.resolve(),
         started_at=args.started_at,
         completed_at=args.completed_at,
         db_config=db_config,
+        jobs=args.jobs,
+        stream_join=args.stream_join,
+        coverage_snapshot=args.coverage_snapshot.resolve()
+        if args.coverage_snapshot
+        else None,
+        coverage_detail=args.coverage_detail,
+        cache_dir=_cache_dir(args),
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
     )
 
 
-def _clone_configs() -> bool:
+def _upload_options(args: argparse.Namespace) -> UploadOptions:
+    return UploadOptions(
+        engine=args.upload_engine,
+        batch_size=args.upload_batch_size,
+        commit_per_batch=args.upload_commit == "batch",
+        workers=args.upload_workers,
+    )
+
+
+def _cache_dir(args: argparse.Namespace) -> pathlib.Path | None:
+    return None if args.no_cache else (args.cache_dir or default_cache_dir())
+
+
+def _clone_configs(args: argparse.Namespace) -> bool:
+    if args.offline:
+        print("Offline: using the existing FITS config checkout")
+        return True
+
     try:
-        subprocess.run(["git-clone-configs"], check=True)
-    except FileNotFoundError:
-        print("Run setup failed: git-clone-configs command not found")
-        return False
-    except subprocess.CalledProcessError as exc:
-        print(
-            "Run setup failed: git-clone-configs exited with status "
-            f"{exc.returncode}"
-        )
+        ttl = args.config_ttl if args.config_ttl is not None else default_config_ttl()
+        stamp = fresh_stamp(ttl)
+        if stamp is not None:
+            age = time.time() - stamp.fetched_at
+            revision = (stamp.revision or "unknown")[:12]
+            print(
+                f"Using FITS configs at revision {revision} fetched {age:.0f}s ago; "
+                "skipping git-clone-configs"
+            )
+            return True
+
+        if getattr(args, "clone_in_background", False):
+            start_clone()
+        else:
+            clone_configs()
+    except (ConfigFetchError, ValueError) as exc:
+        print(f"Run setup failed: {exc}")
         return False
 
     return True
 
 
-def _write_artifacts(artifacts: Sequence[CsvArtifact], output_dir: pathlib.Path):
+def _write_artifacts(
+    artifacts: Sequence[CsvArtifact],
+    output_dir: pathlib.Path,
+    formats: Sequence[str] = ("csv",),
+    compression: str | None = None,
+):
     written: list[tuple[pathlib.Path, str]] = []
     for artifact in artifacts:
-        path = write_csv(artifact, output_dir)
+        path = write_artifact(artifact, output_dir, formats, compression=compression)
         if artifact.table:
             written.append((path, artifact.table))
     return written
 
 
-def _build_execution_artifact(context: RunContext) -> CsvArtifact:
-    return CsvArtifact(
-        name=build_artifact_name(context.db_config.database, "executions"),
-        headers=[
-            "exec_id",
-            "build_type",
-            "archive_dir",
-            "device_type",
-            "started_at",
-            "completed_at",
-        ],
-        rows=[
-            {
-                "exec_id": context.exec_id,
-                "build_type": context.build_type,
-                "archive_dir": str(context.archive_dir),
-                "device_type": context.device_type,
-                "started_at": context.started_at.isoformat()
-                if context.started_at
-                else None,
-                "completed_at": context.completed_at.isoformat()
-                if context.completed_at
-                else None,
-            }
-        ],
-    )
-
-
 def handle_analyze(args: argparse.Namespace) -> int:
     analyzers = available_analyzers()
     spec = analyzers[args.build_type]
@@ -159,60 +443,339 @@ def handle_analyze(args: argparse.Namespace) -> int:
         return 1
 
     try:
-        artifacts = [
-            _build_execution_artifact(context),
-            *list(spec.build(context)),
-        ]
-    except (FileNotFoundError, ValueError) as exc:
+        with stage("build"), profiled():
+            artifacts = [
+                build_execution_artifact(context),
+                *list(spec.build(context)),
+            ]
+    except (ConfigFetchError, FileNotFoundError, ValueError) as exc:
         print(f"Run failed: {exc}")
         return 1
-    uploads = _write_artifacts(artifacts, context.archive_dir)
 
-    print(
-        f"Run {context.exec_id} ({context.build_type}) wrote {len(artifacts)} CSV file(s) to {context.archive_dir}"
-    )
-
-    if not context.device_type:
-        print("Warning: --device-type not provided; continuing without device type.")
+    options = _upload_options(args)
+    upload_requested = args.upload or args.upload_test
+    recording = recorder()
 
-    if args.upload or args.upload_test:
+    if upload_requested and args.upload_direct:
+        if recording:
+            artifacts = _counted(recording, "upload_direct", artifacts)
         try:
-            if context.build_type == "dtk":
-                inserted = upload_dtk(
-                    uploads,
-                    context.db_config,
-                    context.exec_id,
+            with stage("upload_direct"), profiled():
+                _, table_uploads = upload_direct(
+                    artifacts,
                     context.archive_dir,
-                    device_type=context.device_type,
-                    started_at=context.started_at,
-                    completed_at=context.completed_at,
-                )
-            else:
-                inserted = upload_coverage(
-                    uploads,
                     context.db_config,
                     context.exec_id,
+                    context.build_type,
                     context.archive_dir,
                     device_type=context.device_type,
                     started_at=context.started_at,
                     completed_at=context.completed_at,
+                    options=options,
+                    writer=functools.partial(
+                        write_artifact,
+                        formats=args.artifact_formats,
+                        compression=args.artifact_compression,
+                    ),
                 )
-        except (UploadError, FileNotFoundError, ValueError) as exc:
+        except (UploadError, ConfigFetchError, FileNotFoundError, ValueError) as exc:
             print(f"Upload failed: {exc}")
             return 1
+    else:
+        if recording:
+            artifacts = _counted(recording, "write_artifacts", artifacts)
+        try:
+            with stage("write_artifacts"), profiled():
+                uploads = _write_artifacts(
+                    artifacts,
+                    context.archive_dir,
+                    args.artifact_formats,
+                    args.artifact_compression,
+                )
+        except (ConfigFetchError, FileNotFoundError, ValueError) as exc:
+            print(f"Run failed: {exc}")
+            return 1
+
+    print(
+        f"Run {context.exec_id} ({context.build_type}) wrote {len(artifacts)} CSV file(s) to {context.archive_dir}"
+    )
+
+    if not context.device_type:
+        print("Warning: --device-type not provided; continuing without device type.")
+
+    if upload_requested:
+        if not args.upload_direct:
+            try:
+                with stage("upload") as metrics, profiled():
+                    table_uploads = upload_execution(
+                        uploads,
+                        context.db_config,
+                        context.exec_id,
+                        context.build_type,
+                        context.archive_dir,
+                        device_type=context.device_type,
+                        started_at=context.started_at,
+                        completed_at=context.completed_at,
+                        options=options,
+                    )
+                    if metrics:
+                        metrics.rows = sum(upload.rows for upload in table_uploads)
+            except (UploadError, FileNotFoundError, ValueError) as exc:
+                print(f"Upload failed: {exc}")
+                return 1
+        if spec.after_upload:
+            spec.after_upload(context, table_uploads)
+        for upload in table_uploads:
+            print(f"  {upload.table}: {upload.rows} row(s) in {upload.seconds:.2f}s")
+        inserted = sum(upload.rows for upload in table_uploads)
         print(f"Uploaded {inserted} row(s) to MySQL")
 
+    if args.profile_out:
+        stats_path, collapsed_path = profiler().write(context.archive_dir, args.profile_out)
+        print(f"Profile written to {stats_path} and {collapsed_path}")
+
+    if recording:
+        return _report_metrics(args, context, recording.results(), options)
     return 0
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    args = parse_args(argv)
+def _counted(
+    recording: StageRecorder, name: str, artifacts: Sequence[CsvArtifact]
+) -> list[CsvArtifact]:
+    return [
+        dataclasses.replace(artifact, rows=recording.count(name, artifact.rows))
+        for artifact in artifacts
+    ]
+
 
-    if not _clone_configs():
+def _report_metrics(
+    args: argparse.Namespace,
+    context: RunContext,
+    stages: Sequence[StageMetrics],
+    options: UploadOptions,
+) -> int:
+    if args.profile:
+        print("Stage metrics:")
+        for metrics in stages:
+            rate = (
+                f", {metrics.rows_per_second:.0f} rows/s"
+                if metrics.rows_per_second is not None
+                else ""
+            )
+            rows = f", {metrics.rows} row(s)" if metrics.rows is not None else ""
+            print(
+                f"  {metrics.name}: {metrics.wall_seconds:.3f}s wall, "
+                f"{metrics.cpu_seconds:.3f}s CPU{rows}{rate}, "
+                f"peak RSS {metrics.peak_rss_bytes / (1024 * 1024):.1f} MiB"
+            )
+
+    if args.metrics_out:
+        report = {
+            "exec_id": context.exec_id,
+            "build_type": context.build_type,
+            "stages": [metrics.as_dict() for metrics in stages],
+        }
+        args.metrics_out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.metrics_artifact:
+        artifact = build_metrics_artifact(
+            context.db_config.database, context.exec_id, stages
+        )
+        path = write_artifact(
+            artifact,
+            context.archive_dir,
+            args.artifact_formats,
+            compression=args.artifact_compression,
+        )
+        if args.upload or args.upload_test:
+            try:
+                inserted = upload_csv(path, RUN_METRICS_TABLE, context.db_config, options)
+            except (UploadError, FileNotFoundError, ValueError) as exc:
+                print(f"Upload failed: {RUN_METRICS_TABLE}: {exc}")
+                return 1
+            print(f"Uploaded {inserted} {RUN_METRICS_TABLE} row(s) to MySQL")
+
+    return 0
+
+
+def build_batch_contexts(args: argparse.Namespace) -> list[RunContext]:
+    entries = load_manifest(args.manifest)
+    db_config = load_db_config()
+    device = detect_device()
+    exec_ids: set[str] = set()
+    contexts = []
+    for entry in entries:
+        exec_id = generate_exec_id(
+            entry.build_type, test=args.upload_test, taken=exec_ids
+        )
+        exec_ids.add(exec_id)
+        archive_dir = entry.archive_dir or pathlib.Path(f"FITS-RESULTS-{exec_id}")
+        contexts.append(
+            RunContext(
+                exec_id=exec_id,
+                device=device,
+                build_type=entry.build_type,
+                device_type=entry.device_type,
+                info_paths=entry.info_paths,
+                archive_dir=archive_dir.resolve(),
+                started_at=entry.started_at,
+                completed_at=entry.completed_at,
+                db_config=db_config,
+                jobs=args.jobs,
+                stream_join=args.stream_join,
+                cache_dir=_cache_dir(args),
+                cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+            )
+        )
+    return contexts
+
+
+def handle_batch(args: argparse.Namespace) -> int:
+    analyzers = available_analyzers()
+
+    try:
+        contexts = build_batch_contexts(args)
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"Run setup failed: {exc}")
+        return 1
+    if not contexts:
+        print(f"Run setup failed: no entries in {args.manifest}")
         return 1
 
+    options = _upload_options(args)
+    upload_requested = args.upload or args.upload_test
+    started = time.perf_counter()
+    failed = 0
+    inserted = 0
+
+    with contextlib.ExitStack() as stack:
+        pool = (
+            stack.enter_context(
+                open_pool(contexts[0].db_config, options, options.workers)
+            )
+            if upload_requested
+            else None
+        )
+        try:
+            results = run_batch(
+                contexts,
+                workers=args.workers,
+                formats=args.artifact_formats,
+                compression=args.artifact_compression,
+            )
+            for result in results:
+                context = result.context
+                if result.error:
+                    failed += 1
+                    print(f"Run {context.exec_id} ({context.build_type}) failed: {result.error}")
+                    continue
+
+                print(
+                    f"Run {context.exec_id} ({context.build_type}) wrote {result.artifacts} "
+                    f"CSV file(s) to {context.archive_dir} in {result.seconds:.2f}s"
+                )
+                if not upload_requested:
+                    continue
+
+                try:
+                    table_uploads = upload_execution(
+                        result.uploads,
+                        context.db_config,
+                        context.exec_id,
+                        context.build_type,
+                        context.archive_dir,
+                        device_type=context.device_type,
+                        started_at=context.started_at,
+                        completed_at=context.completed_at,
+                        options=options,
+                        pool=pool,
+                    )
+                except (UploadError, FileNotFoundError, ValueError) as exc:
+                    failed += 1
+                    print(f"Upload failed for {context.exec_id}: {exc}")
+                    continue
+                spec = analyzers[context.build_type]
+                if spec.after_upload:
+                    spec.after_upload(context, table_uploads)
+                inserted += sum(upload.rows for upload in table_uploads)
+        except (FileNotFoundError, ValueError) as exc:
+            print(f"Run setup failed: {exc}")
+            return 1
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Batch finished {len(contexts) - failed}/{len(contexts)} run(s) in {elapsed:.2f}s"
+    )
+    if upload_requested:
+        print(f"Uploaded {inserted} row(s) to MySQL")
+    return 1 if failed else 0
+
+
+def handle_upload(args: argparse.Namespace) -> int:
+    try:
+        archives = find_archives(path.resolve() for path in args.archive_dirs)
+        db_config = load_db_config()
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"Upload failed: {exc}")
+        return 1
+    if not archives:
+        print("Upload failed: no archive directories found")
+        return 1
+
+    options = UploadOptions(
+        engine="insert",
+        batch_size=args.upload_batch_size,
+        workers=args.upload_workers,
+    )
+    started = time.perf_counter()
+    results = upload_archives(archives, db_config, options)
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        if result.error:
+            print(f"  {result.archive_dir}: failed: {result.error}")
+            continue
+        print(f"  {result.archive_dir}: {result.rows} row(s) in {result.seconds:.2f}s")
+
+    inserted = sum(result.rows for result in results)
+    failed = sum(1 for result in results if result.error)
+    rate = inserted / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Uploaded {inserted} row(s) from {len(results) - failed}/{len(results)} "
+        f"archive(s) to MySQL in {elapsed:.2f}s ({rate:.0f} rows/s)"
+    )
+    if failed:
+        print(f"Upload failed for {failed} archive(s); re-run to resume them")
+        return 1
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+
     if args.command == "analyze":
-        return handle_analyze(args)
+        if args.profile or args.metrics_out or args.metrics_artifact:
+            start_recording()
+        if args.profile_out:
+            start_profiling()
+        with stage("clone_configs"):
+            cloned = _clone_configs(args)
+        if not cloned:
+            return 1
+        try:
+            return handle_analyze(args)
+        finally:
+            # Reap a background clone the run finished (or failed) without needing.
+            with contextlib.suppress(ConfigFetchError):
+                wait_for_configs()
+
+    if args.command == "batch":
+        if not _clone_configs(args):
+            return 1
+        return handle_batch(args)
+
+    if args.command == "upload":
+        return handle_upload(args)
 
     raise ValueError(f"Unknown command: {args.command}")
 
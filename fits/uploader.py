@@ -1,20 +1,75 @@
 """Upload helpers for CSV artifacts."""
 from __future__ import annotations
 
+import contextlib
 import csv
+import functools
 import importlib
+import itertools
+import json
+import queue
 import pathlib
 import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable
-
+from typing import Callable, Container, Iterable, Mapping, Sequence
+
+from .artifacts import (
+    CsvArtifact,
+    is_compressed,
+    open_artifact,
+    parse_artifact_name,
+    write_csv,
+)
 from .config import DatabaseConfig
 
 
+UPLOAD_ENGINES = ("auto", "load-data", "insert")
+
+# Client and server error numbers reported when LOAD DATA LOCAL INFILE is
+# disabled: ER_NOT_ALLOWED_COMMAND, CR_LOAD_DATA_LOCAL_INFILE_REJECTED and
+# ER_CLIENT_LOCAL_FILES_DISABLED.
+_LOCAL_INFILE_DISABLED_ERRNOS = {1148, 2068, 3948}
+DEFAULT_BATCH_SIZE = 1000
+CHECKPOINT_FILE = "fits.upload.checkpoint.json"
+ARCHIVE_DIR_PATTERN = "FITS-RESULTS-*"
+EXECUTIONS_TABLE = "executions"
+# Test uploads use this in place of the year so they sort after every real run.
+TEST_EXEC_ID_PREFIX = "9999"
+
+
+@dataclass
+class UploadOptions:
+    """Tuning knobs for how artifact rows are sent to MySQL."""
+
+    engine: str = "auto"
+    batch_size: int = DEFAULT_BATCH_SIZE
+    commit_per_batch: bool = False
+    workers: int = 1
+
+
+@dataclass
+class TableUpload:
+    """Row count and wall time for one uploaded artifact table."""
+
+    table: str
+    path: pathlib.Path
+    rows: int
+    seconds: float
+
+
 class UploadError(RuntimeError):
     """Raised when a CSV upload fails."""
 
 
+class LocalInfileRejected(UploadError):
+    """Raised when the server or client refuses LOAD DATA LOCAL INFILE."""
+
+
 def _mode_task_id(build_type: str) -> str:
     mapping = {"dtk": "01", "coverage": "02"}
     if build_type not in mapping:
@@ -22,19 +77,34 @@ def _mode_task_id(build_type: str) -> str:
     return mapping[build_type]
 
 
-def generate_exec_id(build_type: str, *, test: bool = False) -> str:
-    """Build an 18-digit execution identifier for uploads."""
+def is_test_exec_id(exec_id: str) -> bool:
+    """Return whether *exec_id* was generated for a test upload."""
+
+    return exec_id.startswith(TEST_EXEC_ID_PREFIX)
+
+
+def generate_exec_id(
+    build_type: str, *, test: bool = False, taken: Container[str] = ()
+) -> str:
+    """Build an 18-digit execution identifier for uploads.
+
+    Identifiers in *taken* are never returned, so callers generating several
+    ids in the same second can keep them distinct.
+    """
 
-    now = datetime.now()
-    random_suffix = f"{random.randint(0, 99):02d}"
     task_id = _mode_task_id(build_type)
-    prefix = "9999" if test else now.strftime("%Y")
-    timestamp = now.strftime("%m%d%H%M%S")
-    return f"{prefix}{timestamp}{random_suffix}{task_id}"
+    while True:
+        now = datetime.now()
+        random_suffix = f"{random.randint(0, 99):02d}"
+        prefix = TEST_EXEC_ID_PREFIX if test else now.strftime("%Y")
+        timestamp = now.strftime("%m%d%H%M%S")
+        exec_id = f"{prefix}{timestamp}{random_suffix}{task_id}"
+        if exec_id not in taken:
+            return exec_id
 
 
 def _read_rows(path: pathlib.Path):
-    with path.open(newline="", encoding="utf-8-sig") as csv_file:
+    with open_artifact(path) as csv_file:
         reader = csv.DictReader(csv_file)
         for row in reader:
             yield {
@@ -43,12 +113,21 @@ def _read_rows(path: pathlib.Path):
             }
 
 
-def _connect(config: DatabaseConfig):
-    spec = importlib.util.find_spec("mysql.connector")
-    if spec is None:  # pragma: no cover - import guard
+def _read_columns(path: pathlib.Path) -> list[str]:
+    with open_artifact(path) as csv_file:
+        return next(csv.reader(csv_file), [])
+
+
+@functools.lru_cache(maxsize=None)
+def _mysql_connector():
+    try:
+        return importlib.import_module("mysql.connector")
+    except ImportError:  # pragma: no cover - import guard
         raise UploadError("mysql-connector-python is not installed")
 
-    mysql = importlib.import_module("mysql.connector")
+
+def _connect(config: DatabaseConfig, *, allow_local_infile: bool = False):
+    mysql = _mysql_connector()
 
     return mysql.connect(
         host=config.host,
@@ -56,39 +135,333 @@ def _connect(config: DatabaseConfig):
         user=config.user,
         password=config.password,
         database=config.database,
+        allow_local_infile=allow_local_infile,
     ), mysql
 
 
-def upload_csv(path: pathlib.Path, table: str, config: DatabaseConfig) -> int:
-    connection, mysql = _connect(config)
+class ConnectionPool:
+    """A small pool of reusable MySQL connections for one upload session.
+
+    Connections are opened lazily up to ``size`` and handed out one at a time
+    through :meth:`connection`; all of them are closed when the pool closes.
+    """
+
+    def __init__(
+        self,
+        config: DatabaseConfig,
+        size: int = 1,
+        *,
+        allow_local_infile: bool = False,
+    ) -> None:
+        self.config = config
+        self.size = size
+        self.allow_local_infile = allow_local_infile
+        self.local_infile_rejected = False
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened: list[object] = []
+        self._slots = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a connection, opening a new one if none is idle."""
+
+        self._slots.get()
+        try:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection, _ = _connect(
+                    self.config, allow_local_infile=self.allow_local_infile
+                )
+                self._opened.append(connection)
+            try:
+                yield connection
+            finally:
+                self._idle.put(connection)
+        finally:
+            self._slots.put(None)
+
+    def close(self) -> None:
+        for connection in self._opened:
+            connection.close()
+        self._opened.clear()
+        self._idle = queue.LifoQueue()
+
+
+def _load_data_sql(table: str, columns: list[str]) -> str:
+    """Build a LOAD DATA statement matching the layout written by ``write_csv``.
+
+    Artifacts are written with a UTF-8 BOM, ``\\r\\n`` line endings, and
+    double-quote escaping. Empty fields are mapped to ``NULL`` the same way
+    the INSERT path does.
+    """
+
+    variables = ",".join(f"@v{index}" for index in range(len(columns)))
+    assignments = ",".join(
+        f"`{column}`=NULLIF(@v{index},'')" for index, column in enumerate(columns)
+    )
+    return (
+        f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+        "LINES TERMINATED BY '\\r\\n' IGNORE 1 LINES "
+        f"({variables}) SET {assignments}"
+    )
 
-    rows = list(_read_rows(path))
-    if not rows:
-        connection.close()
-        return 0
 
-    placeholders = ",".join(["%s"] * len(rows[0]))
-    columns = ",".join(f"`{column}`" for column in rows[0].keys())
-    sql = f"INSERT INTO `{table}` ({columns}) VALUES ({placeholders})"
+@contextlib.contextmanager
+def _uncompressed(path: pathlib.Path):
+    """Yield a plain-file path for *path*, decompressing to a temp file if needed."""
+
+    if not is_compressed(path):
+        yield path
+        return
 
+    with tempfile.TemporaryDirectory(prefix="fits-load-") as tmp_dir:
+        plain_path = pathlib.Path(tmp_dir) / path.stem
+        with open_artifact(path, binary=True) as source, plain_path.open("wb") as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        yield plain_path
+
+
+def _load_data(connection, path: pathlib.Path, table: str) -> int:
+    """Run ``LOAD DATA LOCAL INFILE`` for *path* without committing.
+
+    Compressed artifacts are streamed into a temporary plain file first,
+    since the server only accepts uncompressed local files.
+    """
+
+    columns = _read_columns(path)
+    if not columns:
+        return 0
+
+    mysql = _mysql_connector()
     try:
-        with connection.cursor() as cursor:
-            cursor.executemany(sql, [tuple(row.values()) for row in rows])
-        connection.commit()
+        with _uncompressed(path) as plain_path, connection.cursor() as cursor:
+            cursor.execute(_load_data_sql(table, columns), (str(plain_path.resolve()),))
+            inserted = cursor.rowcount
     except mysql.Error as exc:  # pragma: no cover - runtime dependent
-        raise UploadError(str(exc))
-    finally:
-        connection.close()
+        if getattr(exc, "errno", None) in _LOCAL_INFILE_DISABLED_ERRNOS:
+            raise LocalInfileRejected(str(exc))
+        raise
+
+    return max(inserted, 0)
+
+
+def _insert_sql(table: str, columns: Sequence[str], row_count: int) -> str:
+    placeholders = "(" + ",".join(["%s"] * len(columns)) + ")"
+    joined = ",".join(f"`{column}`" for column in columns)
+    values = ",".join([placeholders] * row_count)
+    return f"INSERT INTO `{table}` ({joined}) VALUES {values}"
+
+
+class BatchInserter:
+    """Accumulate rows and send them as multi-row INSERT batches.
+
+    Rows are pushed one at a time with :meth:`add` and sent ``batch_size`` at
+    a time, so memory stays bounded by one batch. Empty strings are sent as
+    ``NULL`` to match how CSV artifacts are read back. Nothing is committed
+    unless ``commit_per_batch`` is set, in which case ``on_commit`` is called
+    with the running row count after every commit.
+    """
+
+    def __init__(
+        self,
+        connection,
+        table: str,
+        columns: Sequence[str],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        commit_per_batch: bool = False,
+        on_commit: Callable[[int], None] | None = None,
+    ) -> None:
+        self.connection = connection
+        self.table = table
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.commit_per_batch = commit_per_batch
+        self.on_commit = on_commit
+        self.inserted = 0
+        self._full_batch_sql = _insert_sql(table, self.columns, batch_size)
+        self._pending: list[object] = []
+        self._pending_rows = 0
+
+    def add(self, row: Mapping[str, object]) -> None:
+        for column in self.columns:
+            value = row.get(column)
+            self._pending.append(None if value == "" else value)
+        self._pending_rows += 1
+        if self._pending_rows == self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending_rows:
+            return
+
+        sql = (
+            self._full_batch_sql
+            if self._pending_rows == self.batch_size
+            else _insert_sql(self.table, self.columns, self._pending_rows)
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, self._pending)
+        self.inserted += self._pending_rows
+        self._pending = []
+        self._pending_rows = 0
+        if self.commit_per_batch:
+            self.connection.commit()
+            if self.on_commit is not None:
+                self.on_commit(self.inserted)
+
+
+def _insert_rows(
+    connection,
+    path: pathlib.Path,
+    table: str,
+    *,
+    batch_size: int,
+    commit_per_batch: bool,
+) -> int:
+    """Send the rows of *path* through a :class:`BatchInserter`."""
+
+    columns = _read_columns(path)
+    if not columns:
+        return 0
+
+    inserter = BatchInserter(
+        connection,
+        table,
+        columns,
+        batch_size=batch_size,
+        commit_per_batch=commit_per_batch,
+    )
+    for row in _read_rows(path):
+        inserter.add(row)
+    inserter.flush()
+    return inserter.inserted
+
+
+def _upload_table(
+    pool: ConnectionPool,
+    connection,
+    path: pathlib.Path,
+    table: str,
+    options: UploadOptions,
+) -> int:
+    """Upload one artifact over *connection* using the configured engine."""
+
+    if options.engine not in UPLOAD_ENGINES:
+        raise ValueError(f"Unknown upload engine '{options.engine}'")
+
+    if options.engine != "insert" and not pool.local_infile_rejected:
+        try:
+            return _load_data(connection, path, table)
+        except LocalInfileRejected:
+            if options.engine == "load-data":
+                raise
+            pool.local_infile_rejected = True
+
+    return _insert_rows(
+        connection,
+        path,
+        table,
+        batch_size=options.batch_size,
+        commit_per_batch=options.commit_per_batch,
+    )
+
+
+def _insert_execution(
+    connection,
+    exec_id: str,
+    build_type: str,
+    archive_dir: pathlib.Path,
+    *,
+    device_type: str | None = None,
+    started_at: datetime | None = None,
+    completed_at: datetime | None = None,
+) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {EXECUTIONS_TABLE} (exec_id, build_type, archive_dir, device_type, started_at, completed_at) VALUES (%s, %s, %s, %s, %s, %s)",
+            (
+                int(exec_id),
+                build_type,
+                str(archive_dir),
+                device_type,
+                started_at,
+                completed_at,
+            ),
+        )
+
+
+@contextlib.contextmanager
+def _transaction(pool: ConnectionPool):
+    """Borrow a pooled connection and commit on success, roll back on error."""
+
+    mysql = _mysql_connector()
+    with pool.connection() as connection:
+        try:
+            yield connection
+            connection.commit()
+        except mysql.Error as exc:  # pragma: no cover - runtime dependent
+            connection.rollback()
+            raise UploadError(str(exc))
+        except BaseException:
+            connection.rollback()
+            raise
+
+
+def open_pool(config: DatabaseConfig, options: UploadOptions, size: int = 1) -> ConnectionPool:
+    return ConnectionPool(
+        config, size, allow_local_infile=options.engine != "insert"
+    )
+
+
+def upload_csv(
+    path: pathlib.Path,
+    table: str,
+    config: DatabaseConfig,
+    options: UploadOptions | None = None,
+) -> int:
+    """Upload a CSV artifact into *table* and return the inserted row count.
+
+    ``options.engine`` selects ``load-data`` (``LOAD DATA LOCAL INFILE``),
+    ``insert`` (batched INSERTs), or ``auto``, which tries ``load-data`` first
+    and falls back to ``insert`` when local infile is disabled.
+    """
+
+    return upload_many([(path, table)], config, options)
 
-    return len(rows)
 
+def upload_many(
+    paths: Iterable[tuple[pathlib.Path, str]],
+    config: DatabaseConfig,
+    options: UploadOptions | None = None,
+    *,
+    pool: ConnectionPool | None = None,
+) -> int:
+    """Upload multiple CSV files and return the total inserted row count.
 
-def upload_many(paths: Iterable[tuple[pathlib.Path, str]], config: DatabaseConfig) -> int:
-    """Upload multiple CSV files and return the total inserted row count."""
-    total = 0
-    for path, table in paths:
-        total += upload_csv(path, table, config)
-    return total
+    Each file is committed separately over a shared connection. Pass *pool*
+    to reuse connections that outlive this call.
+    """
+
+    options = options or UploadOptions()
+    with contextlib.ExitStack() as stack:
+        if pool is None:
+            pool = stack.enter_context(open_pool(config, options))
+        total = 0
+        for path, table in paths:
+            with _transaction(pool) as connection:
+                total += _upload_table(pool, connection, path, table, options)
+        return total
 
 
 def record_execution(
@@ -101,27 +474,191 @@ def record_execution(
     started_at: datetime | None = None,
     completed_at: datetime | None = None,
 ) -> None:
-    """Insert a single execution row into the executions table."""
+    """Insert a single execution row into the executions table.
+
+    Kept for callers of the original API; :func:`upload_execution` inserts
+    the row together with the run's artifacts.
+    """
+
+    with ConnectionPool(config) as pool:
+        with _transaction(pool) as connection:
+            _insert_execution(
+                connection,
+                exec_id,
+                build_type,
+                archive_dir,
+                device_type=device_type,
+                started_at=started_at,
+                completed_at=completed_at,
+            )
 
-    connection, _ = _connect(config)
-    try:
+
+def _timed_upload(
+    pool: ConnectionPool,
+    connection,
+    path: pathlib.Path,
+    table: str,
+    options: UploadOptions,
+) -> TableUpload:
+    started = time.perf_counter()
+    rows = _upload_table(pool, connection, path, table, options)
+    return TableUpload(table, path, rows, time.perf_counter() - started)
+
+
+def _upload_table_transaction(
+    pool: ConnectionPool, path: pathlib.Path, table: str, options: UploadOptions
+) -> TableUpload:
+    with _transaction(pool) as connection:
+        return _timed_upload(pool, connection, path, table, options)
+
+
+def _discard_execution(
+    pool: ConnectionPool, exec_id: str, tables: Iterable[str]
+) -> None:
+    """Delete rows already committed for *exec_id* after a failed upload."""
+
+    with _transaction(pool) as connection:
         with connection.cursor() as cursor:
-            cursor.execute(
-                "INSERT INTO executions (exec_id, build_type, archive_dir, device_type, started_at, completed_at) VALUES (%s, %s, %s, %s, %s, %s)",
-                (
-                    int(exec_id),
-                    build_type,
-                    str(archive_dir),
-                    device_type,
-                    started_at,
-                    completed_at,
-                ),
+            for table in tables:
+                cursor.execute(
+                    f"DELETE FROM `{table}` WHERE exec_id = %s", (int(exec_id),)
+                )
+            cursor.execute("DELETE FROM executions WHERE exec_id = %s", (int(exec_id),))
+
+
+def delete_execution(
+    config: DatabaseConfig, exec_id: str, tables: Iterable[str]
+) -> None:
+    """Delete an execution row and its rows in *tables*."""
+
+    with ConnectionPool(config) as pool:
+        _discard_execution(pool, exec_id, tables)
+
+
+def upload_execution(
+    paths: Iterable[tuple[pathlib.Path, str]],
+    config: DatabaseConfig,
+    exec_id: str,
+    build_type: str,
+    archive_dir: pathlib.Path,
+    *,
+    device_type: str | None = None,
+    started_at: datetime | None = None,
+    completed_at: datetime | None = None,
+    options: UploadOptions | None = None,
+    pool: ConnectionPool | None = None,
+) -> list[TableUpload]:
+    """Insert the execution row and every artifact table for one run.
+
+    With a single worker everything, including the ``executions`` row, is
+    sent in one transaction, so a failed artifact leaves no orphan execution.
+    With ``options.workers`` above one, the execution row is committed first
+    and tables are uploaded concurrently, one pooled connection per worker;
+    if any table fails, rows already committed for the run are deleted again.
+    ``options.commit_per_batch`` commits as it goes and gives up both
+    guarantees.
+    """
+
+    options = options or UploadOptions()
+    paths = list(paths)
+    ensure_ready(paths)
+    execution = dict(
+        device_type=device_type, started_at=started_at, completed_at=completed_at
+    )
+
+    with contextlib.ExitStack() as stack:
+        if pool is None:
+            pool = stack.enter_context(open_pool(config, options, options.workers))
+
+        if options.workers <= 1:
+            with _transaction(pool) as connection:
+                _insert_execution(connection, exec_id, build_type, archive_dir, **execution)
+                return [
+                    _timed_upload(pool, connection, path, table, options)
+                    for path, table in paths
+                ]
+
+        with _transaction(pool) as connection:
+            _insert_execution(connection, exec_id, build_type, archive_dir, **execution)
+
+        with ThreadPoolExecutor(max_workers=options.workers) as executor:
+            futures = [
+                executor.submit(_upload_table_transaction, pool, path, table, options)
+                for path, table in paths
+            ]
+        failures = [future.exception() for future in futures if future.exception()]
+        if failures:
+            # A failed table may still have committed batches with
+            # commit_per_batch, so every table is cleaned up.
+            tables = dict.fromkeys(table for _, table in paths)
+            _discard_execution(pool, exec_id, tables)
+            raise failures[0]
+        return [future.result() for future in futures]
+
+
+def upload_direct(
+    artifacts: Iterable[CsvArtifact],
+    output_dir: pathlib.Path,
+    config: DatabaseConfig,
+    exec_id: str,
+    build_type: str,
+    archive_dir: pathlib.Path,
+    *,
+    device_type: str | None = None,
+    started_at: datetime | None = None,
+    completed_at: datetime | None = None,
+    options: UploadOptions | None = None,
+    writer: Callable[..., pathlib.Path] = write_csv,
+) -> tuple[list[pathlib.Path], list[TableUpload]]:
+    """Write artifacts and insert their rows into MySQL in a single pass.
+
+    Each analyzer row is handed to the CSV writer and to a
+    :class:`BatchInserter` as it is produced, so rows are never read back
+    from disk. The execution row and every table share one transaction;
+    ``options.engine`` and ``options.workers`` do not apply here.
+    """
+
+    options = options or UploadOptions()
+    written: list[pathlib.Path] = []
+    table_uploads: list[TableUpload] = []
+
+    with open_pool(config, UploadOptions(engine="insert")) as pool:
+        with _transaction(pool) as connection:
+            _insert_execution(
+                connection,
+                exec_id,
+                build_type,
+                archive_dir,
+                device_type=device_type,
+                started_at=started_at,
+                completed_at=completed_at,
             )
-        connection.commit()
-    except Exception as exc:  # pragma: no cover - runtime dependent
-        raise UploadError(str(exc))
-    finally:
-        connection.close()
+            for artifact in artifacts:
+                if not artifact.table:
+                    written.append(writer(artifact, output_dir))
+                    continue
+
+                started = time.perf_counter()
+                inserter = BatchInserter(
+                    connection,
+                    artifact.table,
+                    artifact.headers,
+                    batch_size=options.batch_size,
+                    commit_per_batch=options.commit_per_batch,
+                )
+                path = writer(artifact, output_dir, row_sink=inserter.add)
+                inserter.flush()
+                written.append(path)
+                table_uploads.append(
+                    TableUpload(
+                        artifact.table,
+                        path,
+                        inserter.inserted,
+                        time.perf_counter() - started,
+                    )
+                )
+
+    return written, table_uploads
 
 
 def ensure_ready(paths: Iterable[tuple[pathlib.Path, str]]) -> None:
@@ -142,20 +679,25 @@ def upload_dtk(
     device_type: str | None = None,
     started_at: datetime | None = None,
     completed_at: datetime | None = None,
+    options: UploadOptions | None = None,
 ) -> int:
-    """Upload DTK artifacts and record the execution."""
+    """Upload DTK artifacts and record the execution.
 
-    ensure_ready(paths)
-    record_execution(
+    Thin wrapper over :func:`upload_execution` kept for the original API.
+    """
+
+    uploads = upload_execution(
+        paths,
+        config,
         exec_id,
         "dtk",
         archive_dir,
-        config,
         device_type=device_type,
         started_at=started_at,
         completed_at=completed_at,
+        options=options,
     )
-    return upload_many(paths, config)
+    return sum(upload.rows for upload in uploads)
 
 
 def upload_coverage(
@@ -167,17 +709,283 @@ def upload_coverage(
     device_type: str | None = None,
     started_at: datetime | None = None,
     completed_at: datetime | None = None,
+    options: UploadOptions | None = None,
 ) -> int:
-    """Upload coverage artifacts and record the execution."""
+    """Upload coverage artifacts and record the execution.
 
-    ensure_ready(paths)
-    record_execution(
+    Thin wrapper over :func:`upload_execution` kept for the original API.
+    """
+
+    uploads = upload_execution(
+        paths,
+        config,
         exec_id,
         "coverage",
         archive_dir,
-        config,
         device_type=device_type,
         started_at=started_at,
         completed_at=completed_at,
+        options=options,
     )
-    return upload_many(paths, config)
+    return sum(upload.rows for upload in uploads)
+
+
+class UploadCheckpoint:
+    """Upload progress for one archive directory, stored as JSON beside it.
+
+    Records whether the execution row was inserted and, per table, how many
+    rows for the execution the table already held when this archive started
+    uploading to it (``base``), how many have been committed since, and
+    whether the table is complete.
+    """
+
+    def __init__(self, path: pathlib.Path, exec_id: str) -> None:
+        self.path = path
+        self.exec_id = exec_id
+        self.execution_recorded = False
+        self.tables: dict[str, dict[str, object]] = {}
+
+    @classmethod
+    def load(cls, path: pathlib.Path, exec_id: str) -> "UploadCheckpoint":
+        checkpoint = cls(path, exec_id)
+        if not path.exists():
+            return checkpoint
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if str(data.get("exec_id")) != str(exec_id):
+            return checkpoint
+        checkpoint.execution_recorded = bool(data.get("execution_recorded"))
+        checkpoint.tables = dict(data.get("tables") or {})
+        return checkpoint
+
+    def save(self) -> None:
+        pending = self.path.with_name(self.path.name + ".tmp")
+        pending.write_text(
+            json.dumps(
+                {
+                    "exec_id": self.exec_id,
+                    "execution_recorded": self.execution_recorded,
+                    "tables": self.tables,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        pending.replace(self.path)
+
+    def is_done(self, table: str) -> bool:
+        return bool(self.tables.get(table, {}).get("done"))
+
+    def base(self, table: str) -> int | None:
+        entry = self.tables.get(table)
+        # Checkpoints written before "base" existed counted every row as ours.
+        return None if entry is None else int(entry.get("base", 0))
+
+    def start(self, table: str, base: int) -> None:
+        self.tables[table] = {"base": base, "rows": 0, "done": False}
+        self.save()
+
+    def update(self, table: str, rows: int, *, done: bool = False) -> None:
+        self.tables[table] = {"base": self.base(table) or 0, "rows": rows, "done": done}
+        self.save()
+
+
+def archive_artifacts(archive_dir: pathlib.Path) -> list[tuple[pathlib.Path, str]]:
+    """Return ``(path, table)`` pairs for the CSV artifacts in an archive."""
+
+    artifacts = []
+    for path in sorted(archive_dir.iterdir()):
+        parsed = parse_artifact_name(path.name)
+        if parsed is not None:
+            artifacts.append((path, parsed[1]))
+    return artifacts
+
+
+def read_execution(archive_dir: pathlib.Path) -> dict[str, object]:
+    """Read the execution row from an archive's ``executions`` CSV."""
+
+    for path, table in archive_artifacts(archive_dir):
+        if table != EXECUTIONS_TABLE:
+            continue
+        row = next(_read_rows(path), None)
+        if row is None or not row.get("exec_id"):
+            raise UploadError(f"No execution row found in {path}")
+        for column in ("started_at", "completed_at"):
+            if row.get(column):
+                row[column] = datetime.fromisoformat(row[column])
+        return row
+
+    raise UploadError(f"No executions artifact found in {archive_dir}")
+
+
+def _count_rows(connection, table: str, exec_id: str) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT COUNT(*) FROM `{table}` WHERE exec_id = %s", (int(exec_id),)
+        )
+        (count,) = cursor.fetchone()
+    return int(count)
+
+
+def resume_upload(
+    archive_dir: pathlib.Path,
+    config: DatabaseConfig,
+    options: UploadOptions | None = None,
+    *,
+    pool: ConnectionPool | None = None,
+) -> list[TableUpload]:
+    """Upload an archive directory, resuming from its checkpoint if present.
+
+    Rows are committed batch by batch and progress is written to
+    :data:`CHECKPOINT_FILE` after every commit. Before continuing a table,
+    the committed row count for the execution is re-read from the database
+    and the checkpoint's ``base`` (rows that were there before this archive
+    first touched the table) subtracted, so a crash between a commit and
+    the checkpoint write cannot resend a batch, and rows from another
+    source never shift the offset. The execution row is only inserted if it
+    does not exist yet.
+    Uploads always use batched INSERTs because ``LOAD DATA`` cannot resume
+    part-way through a file.
+    """
+
+    options = options or UploadOptions()
+    execution = read_execution(archive_dir)
+    exec_id = str(execution["exec_id"])
+    paths = [
+        (path, table)
+        for path, table in archive_artifacts(archive_dir)
+        if table != EXECUTIONS_TABLE
+    ]
+    ensure_ready(paths)
+    checkpoint = UploadCheckpoint.load(archive_dir / CHECKPOINT_FILE, exec_id)
+    table_uploads: list[TableUpload] = []
+
+    with contextlib.ExitStack() as stack:
+        if pool is None:
+            pool = stack.enter_context(ConnectionPool(config))
+
+        if not checkpoint.execution_recorded:
+            with _transaction(pool) as connection:
+                if not _count_rows(connection, EXECUTIONS_TABLE, exec_id):
+                    _insert_execution(
+                        connection,
+                        exec_id,
+                        str(execution["build_type"]),
+                        pathlib.Path(str(execution["archive_dir"] or archive_dir)),
+                        device_type=execution.get("device_type"),
+                        started_at=execution.get("started_at"),
+                        completed_at=execution.get("completed_at"),
+                    )
+            checkpoint.execution_recorded = True
+            checkpoint.save()
+
+        for path, table in paths:
+            if checkpoint.is_done(table):
+                continue
+
+            started = time.perf_counter()
+            with _transaction(pool) as connection:
+                committed = _count_rows(connection, table, exec_id)
+                base = checkpoint.base(table)
+                if base is None:
+                    base = committed
+                    checkpoint.start(table, base)
+                offset = committed - base
+                if offset < 0:
+                    raise UploadError(
+                        f"{table} holds fewer rows for {exec_id} than {CHECKPOINT_FILE} "
+                        f"recorded; delete the checkpoint and the rows to upload again"
+                    )
+                inserter = BatchInserter(
+                    connection,
+                    table,
+                    _read_columns(path),
+                    batch_size=options.batch_size,
+                    commit_per_batch=True,
+                    on_commit=lambda rows: checkpoint.update(table, offset + rows),
+                )
+                for row in itertools.islice(_read_rows(path), offset, None):
+                    inserter.add(row)
+                inserter.flush()
+            checkpoint.update(table, offset + inserter.inserted, done=True)
+            table_uploads.append(
+                TableUpload(
+                    table, path, inserter.inserted, time.perf_counter() - started
+                )
+            )
+
+    return table_uploads
+
+
+@dataclass
+class ArchiveUpload:
+    """Outcome of uploading one archive directory."""
+
+    archive_dir: pathlib.Path
+    tables: list[TableUpload]
+    seconds: float
+    error: str | None = None
+
+    @property
+    def rows(self) -> int:
+        return sum(upload.rows for upload in self.tables)
+
+
+def find_archives(paths: Iterable[pathlib.Path]) -> list[pathlib.Path]:
+    """Expand *paths* into archive directories.
+
+    A path that holds artifacts is taken as is; any other directory is
+    scanned for ``FITS-RESULTS-*`` subdirectories.
+    """
+
+    archives: list[pathlib.Path] = []
+    for path in paths:
+        if not path.is_dir():
+            raise FileNotFoundError(f"Archive directory not found: {path}")
+        if archive_artifacts(path):
+            archives.append(path)
+            continue
+        archives.extend(
+            child for child in sorted(path.glob(ARCHIVE_DIR_PATTERN)) if child.is_dir()
+        )
+    return list(dict.fromkeys(archives))
+
+
+def _upload_archive(
+    archive_dir: pathlib.Path,
+    config: DatabaseConfig,
+    options: UploadOptions,
+    pool: ConnectionPool,
+) -> ArchiveUpload:
+    started = time.perf_counter()
+    try:
+        tables = resume_upload(archive_dir, config, options, pool=pool)
+    except (UploadError, FileNotFoundError, ValueError) as exc:
+        return ArchiveUpload(archive_dir, [], time.perf_counter() - started, str(exc))
+    return ArchiveUpload(archive_dir, tables, time.perf_counter() - started)
+
+
+def upload_archives(
+    archive_dirs: Iterable[pathlib.Path],
+    config: DatabaseConfig,
+    options: UploadOptions | None = None,
+) -> list[ArchiveUpload]:
+    """Upload many archive directories with :func:`resume_upload`.
+
+    Up to ``options.workers`` archives are uploaded at once, sharing a pool
+    of that many connections. A failing archive is reported in its result
+    rather than stopping the others; re-running picks up from its checkpoint.
+    """
+
+    options = options or UploadOptions()
+    archive_dirs = list(archive_dirs)
+    with ConnectionPool(config, options.workers) as pool:
+        with ThreadPoolExecutor(max_workers=options.workers) as executor:
+            return list(
+                executor.map(
+                    lambda archive_dir: _upload_archive(
+                        archive_dir, config, options, pool
+                    ),
+                    archive_dirs,
+                )
+            )
@@ -0,0 +1,12 @@
+-- Per-stage timings uploaded by `fits.run analyze --metrics-artifact`.
+-- One row per pipeline stage plus a `total` row; times are exclusive, so the stages add up to the total.
+CREATE TABLE IF NOT EXISTS daily_build.run_metrics (
+    exec_id BIGINT UNSIGNED NOT NULL,
+    stage VARCHAR(64) NOT NULL,
+    wall_seconds DOUBLE NOT NULL,
+    cpu_seconds DOUBLE NOT NULL,
+    `rows` BIGINT NULL,
+    rows_per_second DOUBLE NULL,
+    peak_rss_bytes BIGINT UNSIGNED NOT NULL,
+    KEY idx_run_metrics_exec (exec_id, stage)
+);
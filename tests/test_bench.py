@@ -0,0 +1,36 @@
+"""Synthetic benchmark inputs must exercise the same paths as real runs."""
+from __future__ import annotations
+
+import pytest
+
+from fits import bench
+
+
+def test_generated_coverage_resolves_modules(tmp_path):
+    bench.generate_inputs(tmp_path, 500)
+    context = bench._context(tmp_path, 1, bench.BENCH_DATABASE)
+
+    rows = list(bench._coverage_rows(context))
+
+    assert len(rows) == 500
+    assert all(row["directory"].startswith("src/") for row in rows)
+    assert all(row["module"] is not None for row in rows)
+    assert any(row["module"] == "override" for row in rows)
+    assert any("-component" in row["module"] for row in rows)
+
+
+def test_coverage_enrich_stage_counts_rows(tmp_path):
+    bench.generate_inputs(tmp_path, 200)
+    context = bench._context(tmp_path, 1, bench.BENCH_DATABASE)
+
+    assert bench._bench_coverage_enrich(context).rows == 200
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "x"])
+def test_repeat_must_be_positive(value):
+    with pytest.raises(SystemExit):
+        bench.parse_args(["--repeat", value])
+
+
+def test_repeat_accepts_positive_counts():
+    assert bench.parse_args(["--repeat", "3"]).repeat == 3
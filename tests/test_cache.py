@@ -0,0 +1,109 @@
+"""The parse cache must replay exactly what a fresh parse produces."""
+from __future__ import annotations
+
+import os
+import pathlib
+
+import pytest
+
+from fits.analyzers import coverage
+from fits.bench import generate_lcov, generate_mappings
+from fits.cache import ENTRY_SUFFIX, ParseCache, cached_rows
+from fits.config import DatabaseConfig, RunContext
+
+
+def _context(tmp_path: pathlib.Path, exec_id: str, cache_dir) -> RunContext:
+    return RunContext(
+        exec_id=exec_id,
+        device="test",
+        build_type="coverage",
+        device_type=None,
+        info_paths=(tmp_path / "coverage.info",),
+        archive_dir=tmp_path / "archive",
+        started_at=None,
+        completed_at=None,
+        db_config=DatabaseConfig("localhost", 3306, "user", "", "daily_build"),
+        cache_dir=cache_dir,
+        cache_max_bytes=1 << 30,
+    )
+
+
+def _entries(directory: pathlib.Path) -> list[str]:
+    return sorted(path.name for path in directory.glob(f"*{ENTRY_SUFFIX}"))
+
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generate_lcov(tmp_path / "coverage.info", 300, seed=4)
+    generate_mappings(tmp_path / "FITS", 300, seed=4)
+    return tmp_path
+
+
+def test_cache_hit_replays_a_fresh_parse(inputs):
+    cache_dir = inputs / "cache"
+    fresh = list(coverage._build_rows(_context(inputs, "1", None)))
+    first = list(coverage._build_rows(_context(inputs, "2", cache_dir)))
+    assert len(_entries(cache_dir)) == 1
+
+    replayed = list(coverage._build_rows(_context(inputs, "3", cache_dir)))
+
+    for rows, exec_id in ((first, "2"), (replayed, "3")):
+        assert all(row["exec_id"] == exec_id for row in rows)
+        assert [{**row, "exec_id": "1"} for row in rows] == fresh
+
+
+def test_mapping_change_only_invalidates_the_child_key(inputs):
+    cache_dir = inputs / "cache"
+    list(coverage._build_rows(_context(inputs, "1", cache_dir)))
+    [before] = _entries(cache_dir)
+    parent = before.split("-")[0]
+
+    overrides = inputs / "FITS" / coverage.COVERAGE_MAPPING_OVERRIDES_FILE
+    overrides.write_text("directory,file_name,module,owner\n", encoding="utf-8")
+    rows = list(coverage._build_rows(_context(inputs, "2", cache_dir)))
+
+    entries = _entries(cache_dir)
+    assert len(entries) == 2 and before in entries
+    # Same tracefile, so the new entry shares the tracefile part of the key.
+    assert all(name.split("-")[0] == parent for name in entries)
+    assert ParseCache(cache_dir).has_children(parent)
+    assert all(row["module"] != "override" for row in rows)
+
+
+def test_eviction_keeps_the_cache_under_its_limit(tmp_path):
+    cache = ParseCache(tmp_path, max_bytes=1 << 20)
+    for key in ("a", "b", "c"):
+        with cache.writer(key) as writer:
+            for value in range(2000):
+                writer.append((key, value))
+    sizes = {key: cache.entry_path(key).stat().st_size for key in ("a", "b", "c")}
+
+    # Age the entries, then read "a" so that "b" becomes least recently used.
+    for key, age in (("a", 30), ("b", 20), ("c", 10)):
+        stat = cache.entry_path(key).stat()
+        os.utime(cache.entry_path(key), (stat.st_atime, stat.st_mtime - age))
+    assert len(list(cache.load("a"))) == 2000
+    cache.max_bytes = sizes["a"] + sizes["c"]
+    cache.evict()
+
+    assert _entries(tmp_path) == [f"a{ENTRY_SUFFIX}", f"c{ENTRY_SUFFIX}"]
+    total = sum(path.stat().st_size for path in tmp_path.glob(f"*{ENTRY_SUFFIX}"))
+    assert total <= cache.max_bytes
+
+
+def test_entries_larger_than_the_limit_are_not_kept(tmp_path):
+    cache = ParseCache(tmp_path, max_bytes=1)
+    with cache.writer("a") as writer:
+        writer.append(("a", 1))
+
+    assert cache.load("a") is None
+    assert _entries(tmp_path) == []
+
+
+def test_cached_rows_without_a_cache_produces_rows():
+    rows = list(
+        cached_rows(None, lambda: "unused", ["exec_id", "a"], "1", lambda: [{"a": 1}])
+    )
+
+    assert rows == [{"a": 1}]
@@ -0,0 +1,148 @@
+"""Indexed mapping lookups must agree with the original linear scans."""
+from __future__ import annotations
+
+import itertools
+import random
+
+import pytest
+
+from fits.analyzers import coverage
+
+
+MAPPING = """directory,module,owner
+src,src,root-owner
+src/graphics,graphics,gfx-owner
+src/graphics/,graphics-dup,dup-owner
+src\\graphics\\render,render,
+/src/graphics/render/vk/,vulkan,vk-owner
+src/graphics/renderer,renderer,r-owner
+src/media,media,media-owner
+src/media,media-dup,dup-owner
+lib/a/b/c,abc,abc-owner
+,empty,nobody
+lib/x,,no-module
+"""
+
+OVERRIDES = """directory,file_name,module,owner
+src/graphics/render,main.c,main,main-owner
+src/graphics/render/,main.c,main-dup,dup-owner
+src\\media,player.c,player,
+lib/a/b/c,only.c,only,only-owner
+lib/a/b/c,,missing-file,nobody
+"""
+
+DIRECTORIES = [
+    "",
+    "src",
+    "src/",
+    "/src/graphics",
+    "src/graphics/render",
+    "src\\graphics\\render\\vk",
+    "src/graphics/render/vk/deep/er",
+    "src/graphics/renderer/x",
+    "src/graphics/rend",
+    "src/graphicsx",
+    "src/media",
+    "src/media/codec",
+    "lib/a/b",
+    "lib/a/b/c",
+    "lib/a/b/cd",
+    "lib/a/b/c/d/e",
+    "lib/x/y",
+    "other/src/graphics",
+]
+FILES = ["main.c", "player.c", "only.c", "", "other.c"]
+
+
+def _linear_module_owner(directory, mapping):
+    """The lookup as it was before the prefix index: longest, then first, match."""
+
+    normalized = directory.strip("/").replace("\\", "/")
+    best = None
+    for mapped_dir, module, owner in mapping:
+        mapped = mapped_dir.strip("/")
+        if normalized == mapped or normalized.startswith(mapped + "/"):
+            if best is None or len(mapped) > len(best[0]):
+                best = (mapped, module, owner)
+    return (best[1], best[2]) if best else (None, None)
+
+
+def _linear_override(directory, file_name, overrides):
+    normalized_dir = directory.strip("/").replace("\\", "/")
+    for mapped_dir, mapped_file, module, owner in overrides:
+        if normalized_dir == mapped_dir.strip("/") and (file_name or "") == mapped_file:
+            return module, owner
+    return None, None
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    (tmp_path / coverage.COVERAGE_MAPPING_FILE).write_text(MAPPING, encoding="utf-8")
+    (tmp_path / coverage.COVERAGE_MAPPING_OVERRIDES_FILE).write_text(
+        OVERRIDES, encoding="utf-8"
+    )
+    return tmp_path
+
+
+def test_prefix_index_matches_linear_lookup(config_dir):
+    mapping = coverage._load_module_mapping(config_dir)
+    index = coverage._index_module_mapping(mapping)
+
+    for directory in DIRECTORIES:
+        assert coverage._module_owner_for_directory(
+            directory, index
+        ) == _linear_module_owner(directory, mapping), directory
+
+
+def test_override_index_matches_linear_lookup(config_dir):
+    overrides = coverage._load_override_mapping(config_dir)
+    index = coverage._index_override_mapping(overrides)
+
+    for directory, file_name in itertools.product(DIRECTORIES, FILES):
+        assert coverage._override_for_file(
+            directory, file_name, index
+        ) == _linear_override(directory, file_name, overrides), (directory, file_name)
+
+
+def test_duplicate_rows_keep_the_first(config_dir):
+    module_index, override_index = coverage._mapping_indexes(config_dir)
+
+    assert coverage._module_owner_for_directory("src/graphics/x", module_index) == (
+        "graphics",
+        "gfx-owner",
+    )
+    assert coverage._module_owner_for_directory("src/media", module_index) == (
+        "media",
+        "media-owner",
+    )
+    assert coverage._override_for_file(
+        "src/graphics/render", "main.c", override_index
+    ) == ("main", "main-owner")
+
+
+def test_random_mappings_match_linear_lookup(tmp_path):
+    rng = random.Random(11)
+    segments = ["a", "b", "ab", "src", "x"]
+
+    def path(depth):
+        return "/".join(rng.choice(segments) for _ in range(depth))
+
+    lines = ["directory,module,owner"]
+    for number in range(200):
+        directory = path(rng.randint(1, 4))
+        if rng.random() < 0.2:
+            directory = directory.replace("/", "\\")
+        if rng.random() < 0.2:
+            directory = f"/{directory}/"
+        lines.append(f"{directory},module{number},owner{number}")
+    (tmp_path / coverage.COVERAGE_MAPPING_FILE).write_text(
+        "\n".join(lines) + "\n", encoding="utf-8"
+    )
+    mapping = coverage._load_module_mapping(tmp_path)
+    index = coverage._index_module_mapping(mapping)
+
+    for _ in range(2000):
+        directory = path(rng.randint(0, 6))
+        assert coverage._module_owner_for_directory(
+            directory, index
+        ) == _linear_module_owner(directory, mapping), directory
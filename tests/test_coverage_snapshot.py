@@ -0,0 +1,226 @@
+"""Incremental coverage uploads diff against a local snapshot of the last full run."""
+from __future__ import annotations
+
+import dataclasses
+import gzip
+import pathlib
+import re
+import sqlite3
+
+import pytest
+
+from fits.analyzers import coverage
+from fits.artifacts import write_csv
+from fits.config import DatabaseConfig, RunContext
+from fits.uploader import TableUpload
+
+
+REPO = pathlib.Path(__file__).resolve().parent.parent
+SF = "/build/foundation/graphic/graphic_2d_ext/ddgr"
+FULL_RUN = "202610170000000102"
+INCREMENTAL_RUN = "202610180000000102"
+TEST_RUN = "999910190000000102"
+
+
+HEADER = (
+    "exec_id,directory,file_name,lines_hit,lines_total,functions_hit,"
+    "functions_total,branches_hit,branches_total,module,owner\n"
+)
+ROWS = "202610170000000102,src/a,one.c,1,2,0,0,0,0,mod,own\n"
+
+
+def _context(
+    tmp_path: pathlib.Path, snapshot: pathlib.Path, exec_id: str
+) -> RunContext:
+    return RunContext(
+        exec_id=exec_id,
+        device="test",
+        build_type="coverage",
+        device_type=None,
+        info_paths=(),
+        archive_dir=tmp_path / "archive",
+        started_at=None,
+        completed_at=None,
+        db_config=DatabaseConfig("localhost", 3306, "user", "", "daily_build"),
+        coverage_snapshot=snapshot,
+    )
+
+
+def _results(tmp_path: pathlib.Path, name: str) -> pathlib.Path:
+    path = tmp_path / name
+    data = (HEADER + ROWS).encode("utf-8")
+    path.write_bytes(gzip.compress(data) if name.endswith(".gz") else data)
+    return path
+
+
+@pytest.mark.parametrize("source", ["results.csv", "results.csv.gz"])
+@pytest.mark.parametrize("snapshot_name", ["snap.csv", "snap.csv.gz"])
+def test_snapshot_is_written_with_the_codec_its_name_implies(
+    tmp_path, source, snapshot_name
+):
+    snapshot = tmp_path / "state" / snapshot_name
+    results = _results(tmp_path, source)
+    upload = TableUpload(coverage.COVERAGE_RESULTS_TABLE, results, 1, 0.0)
+
+    coverage.update_coverage_snapshot(
+        _context(tmp_path, snapshot, "202610170000000102"), [upload]
+    )
+
+    raw = snapshot.read_bytes()
+    text = gzip.decompress(raw) if snapshot_name.endswith(".gz") else raw
+    assert text.decode("utf-8") == HEADER + ROWS
+    loaded = coverage._load_snapshot(snapshot)
+    assert loaded.base_exec_id == "202610170000000102"
+    assert list(snapshot.parent.iterdir()) == [snapshot]
+
+
+def _tracefile(path: pathlib.Path, files: dict[str, int]) -> pathlib.Path:
+    """Write one record per SF path with *hits* hit lines out of three."""
+
+    with path.open("w", encoding="utf-8") as info:
+        for sf, hits in files.items():
+            info.write(f"SF:{SF}/{sf}\n")
+            for line in range(1, 4):
+                info.write(f"DA:{line},{int(line <= hits)}\n")
+            info.write("end_of_record\n")
+    return path
+
+
+def _analyze(tmp_path, context: RunContext) -> dict[str, list[dict]]:
+    """Write a run's artifacts, record its upload, and return their rows."""
+
+    artifacts = {}
+    uploads = []
+    for artifact in coverage.build_coverage_artifacts(context):
+        rows = list(artifact.rows)
+        artifacts[artifact.table] = rows
+        path = write_csv(dataclasses.replace(artifact, rows=rows), tmp_path)
+        uploads.append(TableUpload(artifact.table, path, len(rows), 0.0))
+    coverage.update_coverage_snapshot(context, uploads)
+    return artifacts
+
+
+@pytest.fixture
+def checkout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "FITS").mkdir()
+    (tmp_path / "FITS" / coverage.COVERAGE_MAPPING_FILE).write_text(
+        "directory,module,owner\nsrc,src,owner\n", encoding="utf-8"
+    )
+    return tmp_path
+
+
+def test_incremental_run_uploads_only_differences(checkout):
+    snapshot = checkout / "snap.csv"
+    full = _tracefile(
+        checkout / "full.info",
+        {"src/one.c": 1, "src/two.c": 2, "root.c": 3, "src/gone.c": 0},
+    )
+    context = dataclasses.replace(
+        _context(checkout, snapshot, FULL_RUN), info_paths=(full,)
+    )
+
+    first = _analyze(checkout / "run1", context)
+
+    assert sorted(first) == [coverage.COVERAGE_RESULTS_TABLE]
+    assert len(first[coverage.COVERAGE_RESULTS_TABLE]) == 4
+    assert coverage._load_snapshot(snapshot).base_exec_id == FULL_RUN
+
+    incremental = _tracefile(
+        checkout / "incremental.info",
+        {"src/one.c": 1, "src/two.c": 3, "src/new.c": 1},
+    )
+    context = dataclasses.replace(
+        context, exec_id=INCREMENTAL_RUN, info_paths=(incremental,)
+    )
+
+    second = _analyze(checkout / "run2", context)
+
+    changed = second[coverage.COVERAGE_RESULTS_TABLE]
+    assert [(row["directory"], row["file_name"]) for row in changed] == [
+        ("src", "two.c"),
+        ("src", "new.c"),
+    ]
+    assert second[coverage.COVERAGE_REMOVED_FILES_TABLE] == [
+        {"exec_id": INCREMENTAL_RUN, "directory": "", "file_name": "root.c"},
+        {"exec_id": INCREMENTAL_RUN, "directory": "src", "file_name": "gone.c"},
+    ]
+    assert second[coverage.COVERAGE_INCREMENTS_TABLE] == [
+        {"exec_id": INCREMENTAL_RUN, "base_exec_id": FULL_RUN}
+    ]
+    # Incremental runs keep diffing against the same full run.
+    assert coverage._load_snapshot(snapshot).base_exec_id == FULL_RUN
+
+
+def test_test_upload_does_not_refresh_the_snapshot(checkout):
+    snapshot = checkout / "snap.csv"
+    full = _tracefile(checkout / "full.info", {"src/one.c": 1})
+    context = dataclasses.replace(
+        _context(checkout, snapshot, TEST_RUN), info_paths=(full,)
+    )
+
+    _analyze(checkout / "run", context)
+
+    assert not snapshot.exists()
+
+
+def test_snapshot_diff_reemits_skipped_rows_for_repeated_files():
+    unchanged = ("1", "3", "0", "0", "0", "0", "src", "owner")
+    snapshot = coverage._CoverageSnapshot(
+        FULL_RUN,
+        {("src", "one.c"): [unchanged], ("src", "two.c"): [unchanged]},
+    )
+
+    assert snapshot.diff(("src", "one.c"), unchanged) == ([], False)
+    assert snapshot.diff(("src", "one.c"), unchanged) == ([unchanged], True)
+    assert snapshot.diff(("src", "new.c"), unchanged) == ([], True)
+    assert list(snapshot.removed()) == [("src", "two.c")]
+
+
+def _sqlite_script(name: str) -> str:
+    """Translate one of the repo's MySQL scripts into SQLite."""
+
+    sql = (REPO / name).read_text(encoding="utf-8")
+    sql = sql.replace("`daily_build`.", "").replace("daily_build.", "").replace("`", "")
+    sql = sql.replace("CREATE OR REPLACE\nVIEW", "CREATE VIEW").replace("<=>", "IS")
+    sql = re.sub(r"\n\s*(PRIMARY KEY|KEY) [^\n]*", "", sql)
+    return re.sub(r",(\s*\))", r"\1", sql).replace("UNSIGNED ", "")
+
+
+def test_snapshot_view_matches_null_directories():
+    db = sqlite3.connect(":memory:")
+    db.execute(
+        "CREATE TABLE coverage_results (exec_id, directory, file_name, lines_hit,"
+        " lines_total, functions_hit, functions_total, branches_hit,"
+        " branches_total, module, owner)"
+    )
+    db.executescript(_sqlite_script("coverage_incremental_tables.sql"))
+    db.executescript(_sqlite_script("v_coverage_snapshots.sql"))
+    base, increment = int(FULL_RUN), int(INCREMENTAL_RUN)
+    db.executemany(
+        "INSERT INTO coverage_results VALUES (?, ?, ?, 1, 3, 0, 0, 0, 0, NULL, NULL)",
+        [
+            (base, None, "kept.c"),
+            (base, None, "changed.c"),
+            (base, None, "removed.c"),
+            (base, "src", "one.c"),
+            (increment, None, "changed.c"),
+        ],
+    )
+    db.execute("INSERT INTO coverage_increments VALUES (?, ?)", (increment, base))
+    # Root-level files upload an empty directory, which becomes NULL.
+    db.execute(
+        "INSERT INTO coverage_removed_files VALUES (?, NULL, 'removed.c')", (increment,)
+    )
+
+    rows = db.execute(
+        "SELECT source_exec_id, directory, file_name FROM v_coverage_snapshots"
+        " WHERE snapshot_exec_id = ? ORDER BY file_name",
+        (increment,),
+    ).fetchall()
+
+    assert rows == [
+        (increment, None, "changed.c"),
+        (base, None, "kept.c"),
+        (base, "src", "one.c"),
+    ]
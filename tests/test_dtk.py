@@ -0,0 +1,125 @@
+"""The streaming DTK join must yield exactly what the in-memory join does."""
+from __future__ import annotations
+
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+from fits.analyzers import dtk
+from fits.artifacts import write_artifact
+from fits.config import DatabaseConfig, RunContext
+
+
+RESULTS = [
+    "Case1_Clip_1#0.5",
+    "Case1_Clip_2.jpg#0.25",
+    "用例2_Clip_3#",
+    "Case3_Clip_4#0.75",
+    "Case1_Clip_1#0.6",
+    "Case9_Clip_5#text result",
+]
+BASELINE = [
+    "Case1_Clip_1#0.1",
+    "用例2_Clip_3#0.2",
+    "Case1_Clip_1#0.11",
+    "Case4_Only_1#0.4",
+    "Case4_Only_2.JPG#",
+    "Case4_Only_1#0.41",
+    "用例5_Only_3#0.5",
+]
+CASE_TO_MODULE = {"Case1": "graphics", "用例2": "媒体", "Case4": "kernel"}
+MODULE_TO_OWNER = {"graphics": "gfx-owner", "媒体": "负责人"}
+
+
+def _context(tmp_path: pathlib.Path, newline: str) -> RunContext:
+    (tmp_path / "result").mkdir()
+    for path, lines in (
+        (tmp_path / "result" / "output.txt", RESULTS),
+        (tmp_path / "standard_fully.txt", BASELINE),
+    ):
+        path.write_bytes((newline.join(lines) + newline).encode("utf-8"))
+    return RunContext(
+        exec_id="1",
+        device="test",
+        build_type="dtk",
+        device_type=None,
+        info_paths=(),
+        archive_dir=tmp_path / "archive",
+        started_at=None,
+        completed_at=None,
+        db_config=DatabaseConfig("localhost", 3306, "user", "", "daily_build"),
+    )
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_stream_join_matches_read_results(tmp_path, newline):
+    context = _context(tmp_path, newline)
+
+    expected = list(dtk._read_results(context, CASE_TO_MODULE, MODULE_TO_OWNER))
+    streamed = list(dtk._stream_results(context, CASE_TO_MODULE, MODULE_TO_OWNER))
+
+    assert streamed == expected
+    by_case = [(row["case"], row["result"], row["baseline"]) for row in streamed]
+    # The last baseline line of a duplicated case wins.
+    assert by_case[0] == ("Case1_Clip_1", "0.5", "0.11")
+    assert by_case[2] == ("用例2_Clip_3", None, "0.2")
+    # Baseline-only cases follow, duplicates included, in baseline order.
+    assert by_case[len(RESULTS) :] == [
+        ("Case4_Only_1", None, "0.4"),
+        ("Case4_Only_2", None, None),
+        ("Case4_Only_1", None, "0.41"),
+        ("用例5_Only_3", None, "0.5"),
+    ]
+    assert streamed[2]["module"] == "媒体" and streamed[2]["owner"] == "负责人"
+
+
+def test_stream_join_with_empty_baseline(tmp_path):
+    context = _context(tmp_path, "\n")
+    (tmp_path / "standard_fully.txt").write_bytes(b"")
+
+    expected = list(dtk._read_results(context, CASE_TO_MODULE, MODULE_TO_OWNER))
+
+    streamed = dtk._stream_results(context, CASE_TO_MODULE, MODULE_TO_OWNER)
+    assert list(streamed) == expected
+
+
+def test_cases_are_read_as_utf8_whatever_the_locale(tmp_path):
+    _context(tmp_path, "\n")
+    script = (
+        "import pathlib, sys; from fits.analyzers import dtk; "
+        "print(ascii(dtk._read_cases(pathlib.Path(sys.argv[1]))[2]))"
+    )
+    env = {
+        **os.environ,
+        "LC_ALL": "C",
+        "PYTHONUTF8": "0",
+        "PYTHONCOERCECLOCALE": "0",
+        "PYTHONPATH": str(pathlib.Path(__file__).resolve().parent.parent),
+    }
+
+    completed = subprocess.run(
+        [sys.executable, "-c", script, str(tmp_path / "result" / "output.txt")],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == ascii(("用例2_Clip_3", None))
+
+
+def test_free_text_results_write_to_parquet(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.chdir(tmp_path)
+    context = _context(tmp_path, "\n")
+    [artifact] = dtk.build_dtk_artifacts(context)
+
+    write_artifact(artifact, tmp_path / "out", ("csv", "parquet"))
+
+    stem = pathlib.Path(artifact.name).stem
+    table = pq.read_table(tmp_path / "out" / f"{stem}.parquet")
+    assert str(table.schema.field("result").type) == "string"
+    assert "text result" in table.column("result").to_pylist()
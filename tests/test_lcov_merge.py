@@ -0,0 +1,131 @@
+"""Merging several tracefiles must match ``lcov -a`` whatever ``jobs`` is."""
+from __future__ import annotations
+
+import pathlib
+
+import pytest
+
+from fits.analyzers import coverage
+from fits.bench import generate_lcov
+
+
+PREFIX = "/src/foundation/graphic/graphic_2d_ext/ddgr/core"
+
+FIRST = f"""TN:
+SF:{PREFIX}/one.c
+FN:3,init
+FNDA:1,init
+DA:3,1
+DA:4,0
+BRDA:4,0,0,-
+BRDA:4,0,1,2
+BRDA:9,0,0,-
+LF:2
+LH:1
+end_of_record
+SF:{PREFIX}/two.c
+DA:1,0
+end_of_record
+"""
+
+SECOND = f"""SF:{PREFIX}/three.c
+DA:7,5
+end_of_record
+SF:{PREFIX}/one.c
+FN:3,init
+FN:10,other
+FNDA:2,init
+FNDA:0,other
+DA:4,3
+DA:10,0
+BRDA:4,0,0,-
+BRDA:4,0,1,0
+BRDA:9,0,0,-
+end_of_record
+SF:{PREFIX}/two.c
+DA:1,4
+DA:2,0
+end_of_record
+SF:{PREFIX}/one.c
+DA:10,1
+end_of_record
+"""
+
+
+def _write(path: pathlib.Path, text: str) -> pathlib.Path:
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _totals(records) -> list[tuple]:
+    return [
+        (
+            record.sf,
+            record.lines_total,
+            record.lines_hit,
+            record.functions_total,
+            record.functions_hit,
+            record.branches_total,
+            record.branches_hit,
+        )
+        for record in records
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2, 3])
+def test_merge_sums_like_lcov_add(tmp_path, jobs):
+    paths = [_write(tmp_path / "a.info", FIRST), _write(tmp_path / "b.info", SECOND)]
+
+    rows = list(coverage._merge_lcov(paths, jobs, coverage._detail_rows))
+
+    assert rows == [
+        (
+            f"{PREFIX}/one.c",
+            3,
+            "2h5n1h",
+            "4:nh;9:n",
+            [("init", 3, 3), ("other", 10, 0)],
+        ),
+        (f"{PREFIX}/two.c", 1, "1h1m", "", []),
+        (f"{PREFIX}/three.c", 7, "1h", "", []),
+    ]
+    # LF/LH summary lines are ignored; totals come from the merged lines.
+    assert _totals(coverage._merge_lcov(paths, jobs, coverage._detail_record)) == [
+        (f"{PREFIX}/one.c", 3, 3, 2, 1, 3, 1),
+        (f"{PREFIX}/two.c", 2, 1, 0, 0, 0, 0),
+        (f"{PREFIX}/three.c", 1, 1, 0, 0, 0, 0),
+    ]
+
+
+@pytest.mark.parametrize("jobs", [2, 3, 7])
+def test_merge_does_not_depend_on_jobs(tmp_path, jobs):
+    paths = [tmp_path / "full.info", tmp_path / "half.info"]
+    generate_lcov(paths[0], 300, seed=1)
+    generate_lcov(paths[1], 150, seed=1)
+    paths.append(_write(tmp_path / "hand.info", SECOND))
+
+    for convert in (coverage._detail_rows, coverage._detail_record):
+        serial = list(coverage._merge_lcov(paths, 1, convert))
+        parallel = list(coverage._merge_lcov(paths, jobs, convert))
+        if convert is coverage._detail_record:
+            serial, parallel = _totals(serial), _totals(parallel)
+        assert parallel == serial
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_merging_disjoint_shards_matches_the_whole_file(tmp_path, jobs):
+    whole = tmp_path / "whole.info"
+    generate_lcov(whole, 200, seed=2)
+    records = whole.read_text(encoding="utf-8").split("end_of_record\n")[:-1]
+    shards = [
+        _write(
+            tmp_path / f"shard{index}.info",
+            "".join(f"{record}end_of_record\n" for record in part),
+        )
+        for index, part in enumerate((records[:70], records[70:150], records[150:]))
+    ]
+
+    # The generated LH/FNH/BRH lines are random, so compare against the
+    # whole file's recomputed totals rather than _parse_lcov's.
+    expected = list(coverage._merge_lcov([whole], 1, coverage._detail_rows))
+    assert list(coverage._merge_lcov(shards, jobs, coverage._detail_rows)) == expected
@@ -0,0 +1,130 @@
+"""The fast lcov parser must yield exactly what the reference parser does."""
+from __future__ import annotations
+
+import pathlib
+
+import pytest
+
+from fits.analyzers import coverage
+from fits.bench import generate_lcov
+
+
+RECORD_FIELDS = (
+    "sf",
+    "directory",
+    "file_name",
+    "lines_total",
+    "lines_hit",
+    "functions_total",
+    "functions_hit",
+    "branches_total",
+    "branches_hit",
+)
+
+TRACEFILE_LINES = [
+    "TN:suite",
+    "SF:/src/foundation/graphic/graphic_2d_ext/ddgr/core/a.c",
+    "FN:3,init",
+    "FN:9,run",
+    "FNDA:2,init",
+    "FNDA:0,run",
+    "DA:3,2",
+    "DA:4,0",
+    "DA:9,01",
+    "BRDA:4,0,0,1",
+    "BRDA:4,0,1,-",
+    "BRDA:9,0,0,0",
+    "LF:3",
+    "LH:2",
+    "end_of_record",
+    "SF:/src/foundation/graphic/graphic_2d_ext/ddgr/core/b.c ",
+    "DA:1,1",
+    "DA:2,-1",
+    "  DA:3,1  ",
+    "DA:5",
+    "DA:6,3,checksum",
+    "BRDA:1,0,0,2,extra",
+    "FN:1,helper,extra",
+    "FNDA:1,helper",
+    "garbage",
+    "",
+    "FNL:0,1,2",
+    "end_of_record",
+    "SF:/src/foundation/graphic/graphic_2d_ext/ddgr/util/c.c",
+    "DA:7,0",
+    "FNF:2",
+    "FNH:1",
+    "BRF:4",
+    "BRH:0",
+    "SF:/src/foundation/graphic/graphic_2d_ext/ddgr/util/d.c",
+    "DA:1,4",
+    "end_of_record",
+    "SF:e.c",
+    "DA:1,1",
+]
+
+
+def _records(records) -> list[tuple]:
+    return [
+        tuple(getattr(record, field) for field in RECORD_FIELDS) for record in records
+    ]
+
+
+def _write(path: pathlib.Path, newline: str, trailing: bool = True) -> pathlib.Path:
+    text = newline.join(TRACEFILE_LINES) + (newline if trailing else "")
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+@pytest.mark.parametrize("trailing", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 20])
+def test_fast_parser_matches_reference(
+    tmp_path, monkeypatch, newline, trailing, chunk_size
+):
+    info_path = _write(tmp_path / "coverage.info", newline, trailing)
+    expected = _records(coverage._parse_lcov(info_path, "reference"))
+
+    monkeypatch.setattr(coverage, "LCOV_CHUNK_SIZE", chunk_size)
+    assert _records(coverage._parse_lcov(info_path, "fast")) == expected
+
+
+def test_reference_parser_reads_malformed_lines(tmp_path):
+    info_path = _write(tmp_path / "coverage.info", "\n")
+    parsed = _records(coverage._parse_lcov(info_path, "reference"))
+    records = {record[0]: record for record in parsed}
+
+    assert len(records) == 5
+    first = records["/src/foundation/graphic/graphic_2d_ext/ddgr/core/a.c"]
+    assert first[3:] == (3, 2, 2, 1, 3, 1)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_generated_tracefile_matches_reference(tmp_path, monkeypatch, newline):
+    info_path = tmp_path / "generated.info"
+    generate_lcov(info_path, 200, seed=3)
+    if newline != "\n":
+        info_path.write_bytes(info_path.read_bytes().replace(b"\n", newline.encode()))
+    expected = _records(coverage._parse_lcov(info_path, "reference"))
+
+    monkeypatch.setattr(coverage, "LCOV_CHUNK_SIZE", 4096)
+    assert _records(coverage._parse_lcov(info_path, "fast")) == expected
+
+
+@pytest.mark.parametrize("parser", coverage.LCOV_PARSERS)
+@pytest.mark.parametrize("jobs", [2, 3])
+def test_parallel_parse_matches_serial(tmp_path, parser, jobs):
+    info_path = tmp_path / "generated.info"
+    generate_lcov(info_path, 200, seed=5)
+    expected = _records(coverage._parse_lcov(info_path, "reference"))
+
+    shards = coverage._lcov_shards(info_path, jobs * coverage.LCOV_SHARDS_PER_JOB)
+    assert len(shards) > 1
+    assert _records(coverage._parse_lcov_parallel(info_path, jobs, parser)) == expected
+
+
+def test_parallel_parse_of_handwritten_tracefile(tmp_path):
+    info_path = _write(tmp_path / "coverage.info", "\r\n")
+    expected = _records(coverage._parse_lcov(info_path, "reference"))
+
+    assert _records(coverage._parse_lcov_parallel(info_path, 2, "fast")) == expected
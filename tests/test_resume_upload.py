@@ -0,0 +1,146 @@
+"""Interrupted archive uploads resume without losing or repeating rows."""
+from __future__ import annotations
+
+import contextlib
+import json
+import pathlib
+import sqlite3
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+from fits import uploader  # noqa: E402
+from fits.config import DatabaseConfig  # noqa: E402
+
+
+EXEC_ID = "202610170000000102"
+TABLE = "coverage_results"
+ROWS = 25
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class _Cursor:
+    def __init__(self, db: sqlite3.Connection) -> None:
+        self._db = db
+        self._cursor = None
+
+    def __enter__(self) -> "_Cursor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def execute(self, sql: str, params=()) -> None:
+        self._cursor = self._db.execute(sql.replace("%s", "?"), tuple(params))
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+
+class _Connection:
+    """SQLite stand-in for a MySQL connection that can die after a commit."""
+
+    def __init__(self, db: sqlite3.Connection, fail_after_commits: int | None) -> None:
+        self._db = db
+        self.commits = 0
+        self.fail_after_commits = fail_after_commits
+
+    def cursor(self) -> _Cursor:
+        return _Cursor(self._db)
+
+    def commit(self) -> None:
+        self._db.commit()
+        self.commits += 1
+        if self.commits == self.fail_after_commits:
+            # Committed, but the checkpoint has not been updated yet.
+            raise _Interrupted()
+
+    def rollback(self) -> None:
+        self._db.rollback()
+
+
+class _Pool:
+    def __init__(self, db: sqlite3.Connection, fail_after_commits: int | None = None):
+        self._connection = _Connection(db, fail_after_commits)
+
+    @contextlib.contextmanager
+    def connection(self):
+        yield self._connection
+
+
+@pytest.fixture
+def db():
+    connection = sqlite3.connect(":memory:")
+    connection.execute(
+        "CREATE TABLE executions (exec_id INTEGER, build_type, archive_dir,"
+        " device_type, started_at, completed_at)"
+    )
+    connection.execute(f"CREATE TABLE {TABLE} (exec_id INTEGER, directory, file_name)")
+    return connection
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive_dir = tmp_path / f"FITS-RESULTS-{EXEC_ID}"
+    archive_dir.mkdir()
+    (archive_dir / "fits.db.daily_build.executions.csv").write_text(
+        "exec_id,build_type,archive_dir,device_type,started_at,completed_at\n"
+        f"{EXEC_ID},coverage,{archive_dir},,,\n",
+        encoding="utf-8",
+    )
+    lines = ["exec_id,directory,file_name"]
+    lines += [f"{EXEC_ID},src,file{index}.c" for index in range(ROWS)]
+    (archive_dir / f"fits.db.daily_build.{TABLE}.csv").write_text(
+        "\n".join(lines) + "\n", encoding="utf-8"
+    )
+    return archive_dir
+
+
+def _upload(archive: pathlib.Path, pool: _Pool) -> list[uploader.TableUpload]:
+    return uploader.resume_upload(
+        archive,
+        DatabaseConfig("localhost", 3306, "user", "", "daily_build"),
+        uploader.UploadOptions(batch_size=4),
+        pool=pool,
+    )
+
+
+def _files(db: sqlite3.Connection) -> list[str]:
+    rows = db.execute(
+        f"SELECT file_name FROM {TABLE} WHERE directory = 'src' ORDER BY rowid"
+    )
+    return [file_name for (file_name,) in rows]
+
+
+@pytest.mark.parametrize("fail_after_commits", [1, 2, 4])
+def test_interrupted_upload_resumes_without_duplicates(db, archive, fail_after_commits):
+    # The first commit records the execution row; later ones are table batches.
+    with pytest.raises(_Interrupted):
+        _upload(archive, _Pool(db, fail_after_commits))
+
+    [upload] = _upload(archive, _Pool(db))
+
+    assert _files(db) == [f"file{index}.c" for index in range(ROWS)]
+    assert db.execute("SELECT COUNT(*) FROM executions").fetchone() == (1,)
+    checkpoint = json.loads((archive / uploader.CHECKPOINT_FILE).read_text())
+    assert checkpoint["tables"][TABLE] == {"base": 0, "rows": ROWS, "done": True}
+    assert upload.rows == ROWS - max(fail_after_commits - 1, 0) * 4
+
+    assert _upload(archive, _Pool(db)) == []
+    assert len(_files(db)) == ROWS
+
+
+def test_rows_from_another_source_do_not_shift_the_offset(db, archive):
+    db.execute(f"INSERT INTO {TABLE} VALUES (?, 'elsewhere', 'other.c')", (EXEC_ID,))
+
+    with pytest.raises(_Interrupted):
+        _upload(archive, _Pool(db, fail_after_commits=3))
+    _upload(archive, _Pool(db))
+
+    assert _files(db) == [f"file{index}.c" for index in range(ROWS)]
+    checkpoint = json.loads((archive / uploader.CHECKPOINT_FILE).read_text())
+    assert checkpoint["tables"][TABLE]["base"] == 1
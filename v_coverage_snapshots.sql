@@ -0,0 +1,48 @@
+-- Full per-file coverage snapshot for every execution.
+-- Full runs contribute their own coverage_results rows. Incremental runs contribute their changed rows plus
+-- every row of their base execution whose directory + file_name was neither re-uploaded nor removed;
+-- directories are compared with <=> because root-level files have a NULL directory.
+-- Filter on snapshot_exec_id to rebuild a single execution.
+CREATE OR REPLACE
+VIEW `daily_build`.`v_coverage_snapshots` AS
+SELECT
+    cr.exec_id AS snapshot_exec_id,
+    cr.exec_id AS source_exec_id,
+    cr.directory,
+    cr.file_name,
+    cr.lines_hit,
+    cr.lines_total,
+    cr.functions_hit,
+    cr.functions_total,
+    cr.branches_hit,
+    cr.branches_total,
+    cr.module,
+    cr.owner
+FROM daily_build.coverage_results cr
+UNION ALL
+SELECT
+    ci.exec_id AS snapshot_exec_id,
+    base.exec_id AS source_exec_id,
+    base.directory,
+    base.file_name,
+    base.lines_hit,
+    base.lines_total,
+    base.functions_hit,
+    base.functions_total,
+    base.branches_hit,
+    base.branches_total,
+    base.module,
+    base.owner
+FROM daily_build.coverage_increments ci
+JOIN daily_build.coverage_results base
+  ON base.exec_id = ci.base_exec_id
+LEFT JOIN daily_build.coverage_results changed
+  ON changed.exec_id = ci.exec_id
+ AND changed.directory <=> base.directory
+ AND changed.file_name = base.file_name
+LEFT JOIN daily_build.coverage_removed_files removed
+  ON removed.exec_id = ci.exec_id
+ AND removed.directory <=> base.directory
+ AND removed.file_name = base.file_name
+WHERE changed.exec_id IS NULL
+  AND removed.exec_id IS NULL;
@@ -23,8 +23,8 @@ latest_rows AS (
         cr.branches_total,
         cr.module,
         cr.owner
-    FROM daily_build.coverage_results cr
-    JOIN latest_exec le ON cr.exec_id = le.exec_id
+    FROM daily_build.v_coverage_snapshots cr
+    JOIN latest_exec le ON cr.snapshot_exec_id = le.exec_id
 ),
 previous_rows AS (
     SELECT
@@ -35,8 +35,8 @@ previous_rows AS (
         cr.branches_total,
         cr.module,
         cr.owner
-    FROM daily_build.coverage_results cr
-    JOIN previous_exec pe ON cr.exec_id = pe.exec_id
+    FROM daily_build.v_coverage_snapshots cr
+    JOIN previous_exec pe ON cr.snapshot_exec_id = pe.exec_id
 ),
 combined AS (
     -- rows present in previous (with optional latest)